@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+
+MEASURES = ["casual", "registered", "cnt"]
+
+# Dimensi level-hari beserta label yang ditampilkan di dashboard.
+# Kunci harus konstan dalam satu hari (juga untuk hour.csv), karena dihitung dari rollup harian.
+DIMENSIONS = {
+    "weekday": {
+        0: "Sunday",
+        1: "Monday",
+        2: "Tuesday",
+        3: "Wednesday",
+        4: "Thursday",
+        5: "Friday",
+        6: "Saturday",
+    },
+    "season": {
+        1: "Spring",
+        2: "Summer",
+        3: "Fall",
+        4: "Winter",
+    },
+    "mnth": {
+        1: "Jan",
+        2: "Feb",
+        3: "Mar",
+        4: "Apr",
+        5: "May",
+        6: "June",
+        7: "July",
+        8: "Aug",
+        9: "Sep",
+        10: "Oct",
+        11: "Nov",
+        12: "Dec",
+    },
+    "yr": {
+        0: "2011",
+        1: "2012",
+    },
+}
+
+
+def base_year(df):
+    # yr adalah offset dari tahun pertama dataset (0 = 2011); None bila tidak ada kode yr
+    codes = df["yr"].to_numpy()
+    valid = np.flatnonzero(codes >= 0)
+    if not len(valid):
+        return None
+    first = valid[0]
+    return int(pd.Timestamp(df["order_date"].iloc[first]).year - codes[first])
+
+
+def year_labels(df, labels=DIMENSIONS["yr"]):
+    # Label tahun dari base year data, termasuk tahun hasil append (yr >= 2 -> 2013, ...)
+    year = base_year(df)
+    if year is None:
+        return labels
+    codes = df["yr"].to_numpy()
+    return {int(code): str(year + int(code)) for code in np.unique(codes[codes >= 0])}
+
+
+def _sorted_by_date(df):
+    dates = df["order_date"].to_numpy()
+    if len(dates) > 1 and np.any(dates[1:] < dates[:-1]):
+        df = df.sort_values("order_date", kind="stable")
+    return df
+
+
+def create_daily_rollup(df, dimensions=DIMENSIONS):
+    # Satu scan atas baris mentah: jumlah ukuran per hari + kunci dimensi hari itu.
+    # Hari kosong di tengah rentang tetap muncul (seperti resample) dengan kunci -1.
+    df = _sorted_by_date(df)
+    dates = df["order_date"].to_numpy().astype("datetime64[D]")
+    date_dtype = df["order_date"].dtype
+
+    if len(dates) == 0:
+        daily = pd.DataFrame({"order_date": pd.Series([], dtype=date_dtype)})
+        for col in MEASURES:
+            daily[col] = np.zeros(0, dtype=np.int64)
+        for dim in dimensions:
+            daily[dim] = np.zeros(0, dtype=np.int16)
+        return daily
+
+    starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+    sums = np.add.reduceat(df[MEASURES].to_numpy(dtype=np.int64), starts, axis=0)
+
+    days = dates[starts]
+    calendar = np.arange(days[0], days[-1] + np.timedelta64(1, "D"))
+    pos = (days - days[0]).astype(np.int64)
+
+    daily = pd.DataFrame({"order_date": pd.DatetimeIndex(calendar).astype(date_dtype)})
+    for i, col in enumerate(MEASURES):
+        values = np.zeros(len(calendar), dtype=np.int64)
+        values[pos] = sums[:, i]
+        daily[col] = values
+    for dim in dimensions:
+        codes = np.full(len(calendar), -1, dtype=np.int16)
+        codes[pos] = df[dim].to_numpy()[starts]
+        daily[dim] = codes
+    return daily
+
+
+def _bincount_totals(codes, measures, size):
+    # Satu bincount untuk semua ukuran sekaligus: sel = kode * n_ukuran + indeks ukuran
+    valid = codes >= 0
+    codes = codes[valid].astype(np.int64)
+    measures = measures[valid]
+    n_measures = measures.shape[1]
+    cells = (codes[:, None] * n_measures + np.arange(n_measures)).ravel()
+    totals = np.bincount(cells, weights=measures.ravel(), minlength=size * n_measures)
+    present = np.bincount(codes, minlength=size) > 0
+    return totals.reshape(size, n_measures).round().astype(np.int64), present
+
+
+def create_dimension_df(daily, dim, labels):
+    # Ruang kunci dari label dan data: kode di luar label (mis. yr >= 2 untuk data multi-tahun) tetap dihitung
+    codes = daily[dim].to_numpy()
+    size = max(max(labels), int(codes.max()) if len(codes) else -1) + 1
+    totals, present = _bincount_totals(codes, daily[MEASURES].to_numpy(), size)
+    keys = np.flatnonzero(present)
+
+    dim_df = pd.DataFrame(totals[keys], columns=MEASURES)
+    dim_df.insert(0, dim, [labels.get(key, str(key)) for key in keys])
+    dim_df[dim] = dim_df[dim].astype(str)
+    dim_df.rename(columns={
+        "cnt": "total",
+    }, inplace=True)
+    return dim_df
+
+
+def create_aggregates(df, dimensions=DIMENSIONS):
+    daily = create_daily_rollup(df, dimensions)
+
+    daily_orders_df = daily[["order_date"] + MEASURES].rename(columns={
+        "cnt": "total",
+    })
+    aggregates = {"daily": daily_orders_df}
+    for dim, labels in dimensions.items():
+        if dim == "yr":
+            labels = year_labels(daily, labels)
+        aggregates[dim] = create_dimension_df(daily, dim, labels)
+    return aggregates
+
+
+def create_hourly_df(df):
+    hourly_df = df[["order_date"] + MEASURES].rename(columns={
+        "cnt": "total",
+    })
+    return hourly_df.reset_index(drop=True)
+
+
+def create_hour_profile_df(df):
+    # Rata-rata penyewa per jam untuk tiap hari (weekday x hr), via bincount 7 x 24 sel
+    cells = df["weekday"].to_numpy().astype(np.int64) * 24 + df["hr"].to_numpy()
+    sums = np.bincount(cells, weights=df["cnt"].to_numpy(), minlength=7 * 24)
+    counts = np.bincount(cells, minlength=7 * 24)
+    present = counts > 0
+
+    keys = np.flatnonzero(present)
+    labels = DIMENSIONS["weekday"]
+    return pd.DataFrame({
+        "weekday": [labels[key // 24] for key in keys],
+        "hr": (keys % 24).astype(np.int64),
+        "total": sums[present] / counts[present],
+    })
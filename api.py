@@ -0,0 +1,123 @@
+import argparse
+import hashlib
+import json
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from charts import RenderCache
+from cube import load_cube
+from loader import snapshot_path
+
+DATA_PATH = "day.csv"
+CUBE_PATH = snapshot_path(DATA_PATH, "_cube.parquet")
+
+# Body JSON per (versi data, rentang); LRU berbasis byte yang sama dengan cache PNG
+response_cache = RenderCache(max_bytes=32 * 1024 * 1024)
+
+
+def frame_records(df):
+    return json.loads(df.to_json(orient="records", date_format="iso"))
+
+
+def build_payload(cube, start_date, end_date):
+    # Agregasi yang sama dengan dashboard (cache rentang di cube), plus metrik rentang
+    aggregates = cube.aggregates(start_date, end_date)
+    return {
+        "start": str(start_date),
+        "end": str(end_date),
+        "metrics": {
+            "totals": cube.totals(start_date, end_date),
+            "last_year": cube.last_year_totals(start_date, end_date),
+        },
+        **{section: frame_records(df) for section, df in aggregates.items()},
+    }
+
+
+def parse_range(query, cube):
+    start = pd.Timestamp(query.get("start", [cube.min_date])[0]).date()
+    end = pd.Timestamp(query.get("end", [cube.max_date])[0]).date()
+    if start > end:
+        raise ValueError(f"start {start} is after end {end}")
+    return start, end
+
+
+class AggregateHandler(BaseHTTPRequestHandler):
+    csv_path = DATA_PATH
+    cube_path = CUBE_PATH
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/aggregates":
+            return self.send_json(404, {"error": f"unknown path {url.path}"})
+
+        # Versi data = (mtime_ns, size) CSV; ETag dan Last-Modified diturunkan dari situ
+        stat = os.stat(self.csv_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cube = load_cube(self.csv_path, self.cube_path)
+        try:
+            start, end = parse_range(parse_qs(url.query), cube)
+        except ValueError as e:
+            return self.send_json(400, {"error": str(e)})
+
+        key = (stamp, start, end)
+        etag = '"' + hashlib.sha1(repr(key).encode()).hexdigest()[:20] + '"'
+        modified = stamp[0] // 1_000_000_000
+        headers = {"ETag": etag, "Last-Modified": formatdate(modified, usegmt=True), "Cache-Control": "no-cache"}
+        if self.not_modified(etag, modified):
+            return self.send_body(304, b"", headers)
+
+        body = response_cache.get(key)
+        if body is None:
+            body = json.dumps(build_payload(cube, start, end)).encode()
+            response_cache.put(key, body)
+        self.send_body(200, body, headers)
+
+    def not_modified(self, etag, modified):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is not None:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= modified
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def send_json(self, status, payload):
+        self.send_body(status, json.dumps(payload).encode(), {})
+
+    def send_body(self, status, body, headers):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the dashboard aggregates as JSON: GET /aggregates?start=&end=")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--csv", default=DATA_PATH)
+    parser.add_argument("--cube", default=CUBE_PATH)
+    args = parser.parse_args()
+
+    AggregateHandler.csv_path = args.csv
+    AggregateHandler.cube_path = args.cube
+    server = ThreadingHTTPServer((args.host, args.port), AggregateHandler)
+    print(f"serving http://{args.host}:{args.port}/aggregates")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
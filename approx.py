@@ -0,0 +1,164 @@
+import argparse
+import os
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from aggregate import DIMENSIONS, MEASURES, year_labels
+
+# Subset stasiun sebesar ini (jumlah sel) yang belum di-cache ditampilkan sebagai estimasi dulu
+APPROX_MIN_CELLS = int(os.environ.get("DASHBOARD_APPROX_MIN_CELLS", 200_000))
+# Batas waktu pengambilan sampel per rerun
+APPROX_BUDGET_MS = float(os.environ.get("DASHBOARD_APPROX_BUDGET_MS", 250))
+STRATA = 4
+Z_95 = 1.96
+
+
+def needs_approximation(station_cube, stations):
+    return not station_cube.is_cached(stations) and station_cube.subset_cells(stations) >= APPROX_MIN_CELLS
+
+
+def station_strata(station_cube, stations):
+    # Strata = kuantil volume total per stasiun; stasiun besar dan kecil tidak dicampur
+    totals = station_cube.station_totals.loc[list(stations)]
+    n_strata = min(STRATA, len(totals))
+    labels = pd.qcut(totals.rank(method="first"), n_strata, labels=False).to_numpy()
+    return [list(totals.index[labels == h]) for h in range(n_strata)]
+
+
+def station_days(station_cube, station, first_day, n_days, dims):
+    # Ukuran per hari (n_days x ukuran) dan kode dimensi per hari (-1 = tidak ada data) satu stasiun
+    part = station_cube.partition(station)
+    days = part["order_date"].to_numpy().astype("datetime64[D]")
+    lo, hi = np.searchsorted(days, [first_day, first_day + np.timedelta64(n_days, "D")])
+    pos = (days[lo:hi] - first_day).astype(np.int64)
+    values = part[MEASURES].to_numpy(dtype=np.float64)[lo:hi]
+    sums = np.stack([np.bincount(pos, weights=values[:, i], minlength=n_days) for i in range(len(MEASURES))], axis=1)
+    codes = np.full((n_days, len(dims)), -1, dtype=np.int16)
+    for i, dim in enumerate(dims):
+        codes[pos, i] = part[dim].to_numpy()[lo:hi]
+    return sums, codes
+
+
+def stratified_total(samples, sizes):
+    # Estimator total stratifikasi: sum N_h * mean_h, varians dengan koreksi populasi hingga
+    total = sum(size * values.mean(axis=0) for values, size in zip(samples, sizes))
+    var = np.zeros_like(total)
+    for values, size in zip(samples, sizes):
+        n = len(values)
+        if 1 < n < size:
+            var += size ** 2 * (1 - n / size) * values.var(axis=0, ddof=1) / n
+    return total, Z_95 * np.sqrt(var)
+
+
+def _frame(keys, total, err):
+    df = pd.DataFrame(np.round(total).astype(np.int64), columns=MEASURES)
+    for i, col in enumerate(MEASURES):
+        df[f"{col}_err"] = err[:, i]
+    df.insert(0, keys.name, keys.to_numpy())
+    return df.rename(columns={"cnt": "total", "cnt_err": "total_err"})
+
+
+def estimate_aggregates(station_cube, stations, start_date, end_date, budget_ms=APPROX_BUDGET_MS,
+                        dimensions=DIMENSIONS):
+    # Sampel stasiun per strata, diperbesar dua kali lipat selama putaran berikutnya masih muat
+    # di budget. Hasilnya berbentuk sama dengan create_aggregates plus kolom *_err (95% CI).
+    started = time.perf_counter()
+    stations = sorted(set(stations or station_cube.stations))
+    first_day = np.datetime64(max(pd.Timestamp(start_date), station_cube.min_date).date(), "D")
+    last_day = np.datetime64(min(pd.Timestamp(end_date), station_cube.max_date).date(), "D")
+    n_days = max(0, int((last_day - first_day).astype(np.int64)) + 1)
+    dims = list(dimensions)
+
+    strata = station_strata(station_cube, stations)
+    # Urutan sampel deterministik per subset, jadi rerun menampilkan estimasi yang sama
+    rng = np.random.default_rng(zlib.crc32("\n".join(stations).encode()))
+    strata = [[group[i] for i in rng.permutation(len(group))] for group in strata]
+
+    rows = {}
+    n_per_stratum = 2
+    while True:
+        round_started = time.perf_counter()
+        for group in strata:
+            for station in group[:n_per_stratum]:
+                if station not in rows:
+                    rows[station] = station_days(station_cube, station, first_day, n_days, dims)
+        round_ms = (time.perf_counter() - round_started) * 1000
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if n_per_stratum >= max(len(group) for group in strata) or elapsed_ms + 2 * round_ms > budget_ms:
+            break
+        n_per_stratum *= 2
+
+    sampled = [group[:n_per_stratum] for group in strata]
+    sizes = [len(group) for group in strata]
+    samples = [np.stack([rows[station][0] for station in group]) for group in sampled]
+    codes = np.max(np.stack([rows[station][1] for group in sampled for station in group]), axis=0)
+
+    # Kalender dipotong ke hari pertama/terakhir yang ada datanya di sampel
+    observed = np.flatnonzero((codes >= 0).any(axis=1))
+    window = slice(observed[0], observed[-1] + 1) if len(observed) else slice(0, 0)
+    samples = [values[:, window] for values in samples]
+    codes = codes[window]
+    dates = pd.Series(np.arange(first_day, last_day + np.timedelta64(1, "D"))[window],
+                      name="order_date").astype(station_cube.cells["order_date"].dtype)
+
+    total, err = stratified_total(samples, sizes)
+    aggregates = {"daily": _frame(dates, total, err)}
+    for i, (dim, labels) in enumerate(dimensions.items()):
+        if dim == "yr":
+            labels = year_labels(pd.DataFrame({"order_date": dates, "yr": codes[:, i]}), labels)
+        keys = np.unique(codes[:, i][codes[:, i] >= 0])
+        onehot = (codes[:, i][:, None] == keys[None, :]).astype(np.float64)
+        total, err = stratified_total([np.einsum("ndm,dk->nkm", values, onehot) for values in samples], sizes)
+        names = pd.Series([labels.get(int(key), str(key)) for key in keys], name=dim, dtype=str)
+        aggregates[dim] = _frame(names, total, err)
+
+    total, err = stratified_total([values.sum(axis=1) for values in samples], sizes)
+    return {
+        "aggregates": aggregates,
+        "totals": dict(zip(MEASURES, np.round(total).astype(np.int64).tolist())),
+        "totals_err": dict(zip(MEASURES, err.tolist())),
+        "sampled": sum(len(group) for group in sampled),
+        "stations": len(stations),
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare stratified-sample estimates of a station subset with the exact rollup")
+    parser.add_argument("csv_path")
+    parser.add_argument("cube_path", nargs="?", default=None, help="default: the dashboard's station cube for csv_path")
+    parser.add_argument("--stations", nargs="*", default=None)
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--budget-ms", type=float, default=APPROX_BUDGET_MS)
+    args = parser.parse_args()
+
+    from loader import snapshot_path
+    from stations import load_station_cube
+    station_cube = load_station_cube(args.csv_path, args.cube_path or snapshot_path(args.csv_path, "_station_cube.parquet"))
+    if station_cube is None:
+        parser.error(f"{args.csv_path} has no station column")
+    start = args.start or station_cube.min_date
+    end = args.end or station_cube.max_date
+
+    estimate = estimate_aggregates(station_cube, args.stations, start, end, args.budget_ms)
+    started = time.perf_counter()
+    exact = station_cube.subset(args.stations).aggregates(start, end)
+    exact_ms = (time.perf_counter() - started) * 1000
+    print(f"sampled {estimate['sampled']} of {estimate['stations']} stations in {estimate['elapsed_ms']:.1f} ms, "
+          f"exact rollup in {exact_ms:.1f} ms")
+    for section, df in estimate["aggregates"].items():
+        exact_df = exact[section]
+        key = "order_date" if section == "daily" else section
+        merged = df.merge(exact_df[[key, "total"]], on=key, suffixes=("", "_exact"))
+        covered = (merged["total"] - merged["total_exact"]).abs() <= merged["total_err"]
+        error = (merged["total"] - merged["total_exact"]).abs().sum() / max(1, merged["total_exact"].sum())
+        print(f"  {section:<8} {len(merged):>5} rows, total error {error:.2%}, CI covers exact {covered.mean():.0%}")
+    station_cube.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import ast
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD = os.path.join(ROOT, "dashboard.py")
+
+# Budget cold start (ms) untuk semua import di level atas dashboard.py
+DEFAULT_BUDGET_MS = 1500
+# Modul berat yang baru boleh di-import saat chart dirender, atau tidak dipakai sama sekali
+DEFERRED_MODULES = ["matplotlib", "seaborn", "altair", "babel"]
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def top_level_imports(path):
+    # Hanya import di level modul; import di dalam fungsi memang sengaja ditunda
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def importtime(modules):
+    # Proses baru per pengukuran supaya tidak ada modul yang sudah ter-cache
+    code = "; ".join(f"import {module}" for module in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          capture_output=True, text=True, check=True)
+    total_us = 0
+    imported = set()
+    packages = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        total_us += int(self_us)
+        imported.add(name)
+        if not indent:
+            packages[name] = int(cumulative_us)
+    return total_us / 1000, imported, {name: us / 1000 for name, us in packages.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure dashboard.py import time with python -X importtime")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    modules = top_level_imports(DASHBOARD)
+    runs = [importtime(modules) for _ in range(args.repeat)]
+    total_ms = statistics.median(total for total, _, _ in runs)
+    _, imported, packages = runs[-1]
+
+    print(f"imports: {', '.join(modules)}")
+    print(f"{'package':<32} {'cumulative ms':>14}")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<32} {ms:>14.1f}")
+
+    failed = False
+    eager = sorted({name.split(".")[0] for name in imported} & set(DEFERRED_MODULES))
+    if eager:
+        print(f"FAIL imported at startup: {', '.join(eager)}")
+        failed = True
+    print(f"total {total_ms:.1f} ms (median of {args.repeat}), budget {args.budget_ms:.0f} ms")
+    if total_ms > args.budget_ms:
+        print("FAIL import time over budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import SOURCES, write_scaled_csv
+
+# Tiap pengukuran jalan di proses terpisah supaya peak RSS tidak saling tercampur
+CHILD = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+mode, csv_path, memory_mb, stations = sys.argv[1], sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+partition_cols = ["station"] if stations > 1 else []
+stats = {{"merges": 0, "merged_rows": 0}}
+start = time.perf_counter()
+if mode == "chunked":
+    from ingest import build_cube_chunked
+    cells = build_cube_chunked(csv_path, memory_mb, partition_cols, stats)
+else:
+    from cube import build_cube
+    from loader import read_dataset
+    cells = build_cube(read_dataset(csv_path), partition_cols)
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, len(cells), stats["merges"], stats["merged_rows"])
+"""
+
+
+def measure(mode, csv_path, memory_mb, stations):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD.format(root=ROOT), mode, csv_path, str(memory_mb), str(stations)],
+        check=True, capture_output=True, text=True, cwd=ROOT,
+    ).stdout.split()
+    return float(out[0]), int(out[1]) / 1024, int(out[2]), int(out[3]), int(out[4])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak RSS of chunked vs. full-load cube ingest as input grows")
+    parser.add_argument("kind", nargs="?", choices=sorted(SOURCES), default="hour")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--stations", type=int, default=1,
+                        help="stations per copy; with many stations the cube outgrows one chunk")
+    parser.add_argument("--memory-mb", type=int, default=16)
+    parser.add_argument("--skip-full", action="store_true", help="only measure the chunked path")
+    args = parser.parse_args()
+
+    # merged rows = sel yang di-group ulang saat menggabung sel parsial (tetap ~linear terhadap sel)
+    print(f"{'scale':>6} {'rows':>12} {'MB on disk':>11} {'mode':>8} {'seconds':>8} {'peak RSS MB':>12} "
+          f"{'cells':>10} {'merges':>7} {'merged rows':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            csv_path = os.path.join(tmp, f"{args.kind}_x{scale}.csv")
+            rows = write_scaled_csv(SOURCES[args.kind], csv_path, scale, args.stations)
+            size_mb = os.path.getsize(csv_path) / 1024 / 1024
+            modes = ["chunked"] if args.skip_full else ["chunked", "full"]
+            for mode in modes:
+                seconds, rss_mb, cells, merges, merged_rows = measure(mode, csv_path, args.memory_mb, args.stations)
+                print(f"{scale:>6} {rows:>12,} {size_mb:>11.1f} {mode:>8} {seconds:>8.2f} {rss_mb:>12.1f} "
+                      f"{cells:>10,} {merges:>7} {merged_rows:>12,}")
+            os.remove(csv_path)
+
+
+if __name__ == "__main__":
+    main()
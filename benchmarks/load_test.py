@@ -0,0 +1,164 @@
+import argparse
+import datetime
+import json
+import os
+import random
+import struct
+import sys
+import threading
+import time
+import warnings
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+DASHBOARD = os.path.join(ROOT, "dashboard.py")
+
+# Panjang rentang (hari) yang dipilih pengguna simulasi, dengan bobotnya
+RANGE_DAYS = [7, 30, 90, 365, None]
+RANGE_WEIGHTS = [0.25, 0.35, 0.2, 0.1, 0.1]
+TABS = ["Daily Orders", "Day", "Season", "Month", "Year", "Hourly", "Correlation", "Breakdown"]
+
+
+def placeholder_png():
+    # PNG 1x1 untuk menggantikan logo flaticon, supaya tidak ada akses jaringan
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(b"\x00\x00\x00\x00\x00")) + chunk(b"IEND", b""))
+
+
+def stub_remote_images():
+    import streamlit as st
+
+    image = st.image
+    logo = placeholder_png()
+
+    def offline_image(source, *args, **kwargs):
+        if isinstance(source, str) and source.startswith(("http://", "https://")):
+            source = logo
+        return image(source, *args, **kwargs)
+
+    st.image = offline_image
+
+
+def random_range(rng, min_date, max_date):
+    days = rng.choices(RANGE_DAYS, RANGE_WEIGHTS)[0]
+    span = (max_date - min_date).days
+    if days is None or days >= span:
+        return min_date, max_date
+    start = min_date + datetime.timedelta(days=rng.randrange(span - days + 1))
+    return start, start + datetime.timedelta(days=days - 1)
+
+
+def run_session(seed, reruns, tab_switch, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    latencies = []
+    errors = 0
+
+    at = AppTest.from_file(DASHBOARD, default_timeout=timeout)
+    start = time.perf_counter()
+    at.run()
+    latencies.append(time.perf_counter() - start)
+    errors += len(at.exception)
+
+    date_input = at.date_input[0]
+    min_date, max_date = date_input.min, date_input.max
+    for _ in range(reruns):
+        # Kebanyakan pengguna mengganti rentang; sebagian membuka tab lain
+        if rng.random() < tab_switch:
+            at.session_state["section"] = rng.choice(TABS)
+        else:
+            at.date_input[0].set_value(random_range(rng, min_date, max_date))
+        start = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - start)
+        errors += len(at.exception)
+    return latencies, errors
+
+
+def run_level(sessions, reruns, tab_switch, timeout, seed):
+    from memory import process_rss
+
+    rss_before = process_rss()
+    peak_rss = [rss_before or 0]
+    done = threading.Event()
+
+    def sample_rss():
+        while not done.wait(0.1):
+            peak_rss[0] = max(peak_rss[0], process_rss() or 0)
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(lambda i: run_session(seed + i, reruns, tab_switch, timeout), range(sessions)))
+    wall = time.perf_counter() - start
+    done.set()
+    sampler.join()
+
+    latencies = np.array([ms for session, _ in results for ms in session]) * 1000
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "errors": sum(errors for _, errors in results),
+        "wall_s": wall,
+        "throughput": len(latencies) / wall,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p90_ms": float(np.percentile(latencies, 90)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "max_ms": float(latencies.max()),
+        "rss_before_mb": (rss_before or 0) / 2**20,
+        "peak_rss_mb": peak_rss[0] / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay concurrent simulated sessions against dashboard.py with AppTest")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="concurrency levels to run, one after another")
+    parser.add_argument("--reruns", type=int, default=10, help="range/tab changes per session")
+    parser.add_argument("--tab-switch", type=float, default=0.2, help="share of reruns that open another tab")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="write the JSON report to this path")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    # Log timing dashboard tidak ditulis kecuali diminta lewat DASHBOARD_TIMING_LOG
+    os.environ.setdefault("DASHBOARD_TIMING_LOG", "")
+    os.chdir(ROOT)
+    stub_remote_images()
+
+    # Satu sesi pemanasan: cube, indeks, dan import berat dibayar sekali per proses
+    start = time.perf_counter()
+    run_session(args.seed, 0, 0, args.timeout)
+    cold_ms = (time.perf_counter() - start) * 1000
+    print(f"cold start {cold_ms:.0f} ms", file=sys.stderr)
+
+    levels = []
+    for sessions in args.sessions:
+        levels.append(run_level(sessions, args.reruns, args.tab_switch, args.timeout, args.seed))
+        print(f"{sessions} sessions: done", file=sys.stderr)
+
+    print(f"{'sessions':>8} {'reruns':>7} {'err':>4} {'rerun/s':>8} {'p50 ms':>8} {'p90 ms':>8} "
+          f"{'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'RSS MB':>7} {'peak MB':>8}")
+    for level in levels:
+        print(f"{level['sessions']:>8} {level['reruns']:>7} {level['errors']:>4} {level['throughput']:>8.1f} "
+              f"{level['p50_ms']:>8.0f} {level['p90_ms']:>8.0f} {level['p95_ms']:>8.0f} {level['p99_ms']:>8.0f} "
+              f"{level['max_ms']:>8.0f} {level['rss_before_mb']:>7.0f} {level['peak_rss_mb']:>8.0f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"cold_start_ms": cold_ms, "levels": levels}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
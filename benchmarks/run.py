@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import synthetic_factors, write_synthetic
+
+DEFAULT_SCALES = [1, 10, 100]
+DEFAULT_TOLERANCE = 0.25
+
+
+def measure(fn, repeat):
+    # Latensi: median dan minimum dari `repeat` kali jalan; memori: peak alokasi tracemalloc
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "peak_mb": peak / 1024 / 1024,
+    }
+
+
+def bench_dataset(csv_path, repeat, render):
+    import pandas as pd
+
+    from aggregate import DIMENSIONS, create_aggregates, create_daily_rollup, create_dimension_df
+    from cube import build_cube
+    from ingest import build_cube_chunked
+    from loader import read_dataset
+    from timeindex import TimeIndex
+
+    results = {}
+
+    def run(stage, fn, n=repeat):
+        value, stats = measure(fn, n)
+        results[stage] = stats
+        return value
+
+    df = run("load_csv", lambda: read_dataset(csv_path), n=max(1, repeat // 2))
+    run("build_cube_chunked", lambda: build_cube_chunked(csv_path), n=1)
+
+    start = df["order_date"].min() + pd.DateOffset(months=3)
+    end = df["order_date"].max() - pd.DateOffset(months=3)
+    run("filter_mask", lambda: df[(df["order_date"] >= str(start.date())) & (df["order_date"] <= str(end.date()))])
+    index = run("build_time_index", lambda: TimeIndex(df), n=1)
+    main_df = run("filter_time_index", lambda: index.slice(start, end))
+    run("range_totals", lambda: index.totals(start, end))
+
+    daily = run("daily_rollup", lambda: create_daily_rollup(main_df))
+    for dim, labels in DIMENSIONS.items():
+        run(f"dimension_{dim}", lambda dim=dim, labels=labels: create_dimension_df(daily, dim, labels))
+    aggregates = run("create_aggregates", lambda: create_aggregates(main_df))
+
+    cube = run("build_cube", lambda: build_cube(main_df), n=1)
+    run("aggregates_from_cube", lambda: create_aggregates(cube))
+
+    if render:
+        from charts import figure_to_png, plot_section
+        for section, section_df in aggregates.items():
+            run(f"render_{section}", lambda s=section, d=section_df: figure_to_png(plot_section(s, d)), n=1)
+
+    return {"rows": len(df), "stages": results}
+
+
+def compare(current, baseline, tolerance):
+    regressions = []
+    for key, entry in current["runs"].items():
+        base_entry = baseline["runs"].get(key)
+        if base_entry is None:
+            continue
+        for stage, stats in entry["stages"].items():
+            base = base_entry["stages"].get(stage)
+            # Tahap yang sangat cepat terlalu berisik untuk dibandingkan
+            if base is None or base["median_ms"] < 1:
+                continue
+            ratio = stats["median_ms"] / base["median_ms"]
+            if ratio > 1 + tolerance:
+                regressions.append((key, stage, base["median_ms"], stats["median_ms"], ratio))
+    return regressions
+
+
+def print_table(report):
+    print(f"{'dataset':<14} {'rows':>12} {'stage':<22} {'median ms':>10} {'min ms':>10} {'peak MB':>9}")
+    for key, entry in report["runs"].items():
+        for stage, stats in entry["stages"].items():
+            print(f"{key:<14} {entry['rows']:>12,} {stage:<22} {stats['median_ms']:>10.2f} "
+                  f"{stats['min_ms']:>10.2f} {stats['peak_mb']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark for loading, filtering, aggregation and rendering")
+    parser.add_argument("--kinds", nargs="+", default=["day", "hour"], choices=["day", "hour"])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="row multipliers; 1000 is supported but slow and needs several GB of disk")
+    parser.add_argument("--stations", type=int, default=None)
+    parser.add_argument("--years", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-render", action="store_true", help="skip the matplotlib figure stages")
+    parser.add_argument("--data-dir", default=None, help="keep generated CSVs here instead of a temp dir")
+    parser.add_argument("--output", default=None, help="write the JSON report to this path")
+    parser.add_argument("--save-baseline", default=None, help="write the JSON report as the new baseline")
+    parser.add_argument("--baseline", default=None, help="compare against this baseline and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+    for scale in args.scales:
+        try:
+            synthetic_factors(scale, args.stations, args.years)
+        except ValueError as e:
+            parser.error(str(e))
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs": {},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or tmp
+        for kind in args.kinds:
+            for scale in args.scales:
+                key = f"{kind}_x{scale}"
+                if args.stations:
+                    key += f"_s{args.stations}"
+                if args.years:
+                    key += f"_y{args.years}"
+                csv_path = os.path.join(data_dir, f"{key}.csv")
+                if not os.path.exists(csv_path):
+                    write_synthetic(kind, csv_path, scale, args.stations, args.years)
+                report["runs"][key] = bench_dataset(csv_path, args.repeat, not args.no_render)
+                print(f"{key}: done", file=sys.stderr)
+
+    print_table(report)
+    for path in [args.output, args.save_baseline]:
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for key, stage, before, after, ratio in regressions:
+            print(f"REGRESSION {key} {stage}: {before:.2f} ms -> {after:.2f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import Holiday, USFederalHolidayCalendar, nearest_workday
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SOURCES = {
+    "day": os.path.join(ROOT, "day.csv"),
+    "hour": os.path.join(ROOT, "data", "hour.csv"),
+}
+
+SCALES = [1, 10, 100, 1000]
+
+
+class DCHolidayCalendar(USFederalHolidayCalendar):
+    # Libur di dataset = libur federal AS ditambah Emancipation Day (Washington D.C.)
+    rules = USFederalHolidayCalendar.rules + [
+        Holiday("Emancipation Day", month=4, day=16, observance=nearest_workday),
+    ]
+
+
+def calendar_columns(dates, base_year, holidays):
+    # Kolom kalender dataset dihitung dari tanggal (copy pertama identik dengan data sumber)
+    month_day = dates.dt.month * 100 + dates.dt.day
+    weekday = (dates.dt.dayofweek + 1) % 7
+    holiday = dates.isin(holidays).astype(np.int64)
+    return {
+        "season": np.select([month_day < 321, month_day < 621, month_day < 923, month_day < 1221], [1, 2, 3, 4], 1),
+        "yr": dates.dt.year - base_year,
+        "mnth": dates.dt.month,
+        "holiday": holiday,
+        "weekday": weekday,
+        "workingday": ((dates.dt.dayofweek < 5) & (holiday == 0)).astype(np.int64),
+    }
+
+
+def scaled_chunks(src_path, scale, stations=1, seed=0):
+    # Salin data sumber `scale` kali. Tiap salinan mendapat kalender baru tepat 2 tahun berikutnya:
+    # hari ke-i data sumber menjadi hari ke-i periode itu (hari yang tidak ada di periode 730 hari
+    # dibuang), jadi tanggal tetap unik dan urut, lalu semua kolom kalender dihitung ulang.
+    # Dengan stations > 1 tiap salinan diulang per stasiun dengan jumlah penyewa
+    # yang diacak, dan kolom `station` ditambahkan.
+    base = pd.read_csv(src_path)
+    base_dates = pd.to_datetime(base["dteday"])
+    first = base_dates.min()
+    span_years = base_dates.dt.year.max() - first.year + 1
+    base_year = first.year - int(base["yr"].iloc[0])
+    day_index = (base_dates - first).dt.days
+    holidays = DCHolidayCalendar().holidays(first, first + pd.DateOffset(years=scale * span_years))
+    rng = np.random.default_rng(seed)
+
+    instant = 0
+    for copy in range(scale):
+        start = first + pd.DateOffset(years=copy * span_years)
+        keep = day_index < (start + pd.DateOffset(years=span_years) - start).days
+        chunk = base[keep].reset_index(drop=True)
+        dates = start + pd.to_timedelta(day_index[keep].reset_index(drop=True), unit="D")
+        chunk["dteday"] = dates.dt.strftime("%Y-%m-%d")
+        for col, values in calendar_columns(dates, base_year, holidays).items():
+            if col in chunk.columns:
+                chunk[col] = values
+        chunk["instant"] = np.arange(instant + 1, instant + len(chunk) + 1)
+        instant += len(chunk)
+        if stations == 1:
+            yield chunk
+            continue
+
+        for station in range(stations):
+            station_chunk = chunk.copy()
+            factor = rng.uniform(0.5, 1.5)
+            noise = rng.uniform(0.9, 1.1, size=len(chunk))
+            for col in ["casual", "registered"]:
+                station_chunk[col] = np.rint(chunk[col] * factor * noise).astype(np.int64)
+            station_chunk["cnt"] = station_chunk["casual"] + station_chunk["registered"]
+            station_chunk.insert(1, "station", f"S{station + 1:04d}")
+            yield station_chunk
+
+
+def write_scaled_csv(src_path, dst_path, scale, stations=1):
+    os.makedirs(os.path.dirname(dst_path) or ".", exist_ok=True)
+    rows = 0
+    for i, chunk in enumerate(scaled_chunks(src_path, scale, stations)):
+        chunk.to_csv(dst_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+        rows += len(chunk)
+    return rows
+
+
+def synthetic_factors(scale, stations=None, years=None):
+    # scale = salinan 2 tahun (years / 2) x stasiun. Faktor yang tidak diberikan diturunkan dari
+    # scale (tanpa opsi: semuanya stasiun, rentang tanggal tetap realistis); kombinasi yang tidak
+    # menghasilkan tepat scale ditolak supaya label xN selalu sesuai jumlah baris.
+    if years is not None and (years < 2 or years % 2):
+        raise ValueError(f"--years must be a positive multiple of 2, got {years}")
+    copies = years // 2 if years else (1 if stations is None else scale // stations)
+    n_stations = stations if stations is not None else (scale // copies if copies else 0)
+    if copies < 1 or n_stations < 1 or copies * n_stations != scale:
+        given = ", ".join(f"--{name} {value}" for name, value in [("stations", stations), ("years", years)] if value)
+        raise ValueError(f"x{scale} does not match {given}: scale must equal years / 2 x stations")
+    return copies, n_stations
+
+
+def write_synthetic(kind, dst_path, scale, stations=None, years=None):
+    copies, stations = synthetic_factors(scale, stations, years)
+    return write_scaled_csv(SOURCES[kind], dst_path, copies, stations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write day.csv / hour.csv-schema data at N times the sample size")
+    parser.add_argument("kind", choices=sorted(SOURCES))
+    parser.add_argument("scale", type=int, help="row multiplier, e.g. 1, 10, 100, 1000")
+    parser.add_argument("dst_path")
+    parser.add_argument("--stations", type=int, default=None, help="number of stations (default: derived from scale)")
+    parser.add_argument("--years", type=int, default=None, help="years of history, in steps of 2 (default: 2)")
+    args = parser.parse_args()
+
+    try:
+        rows = write_synthetic(args.kind, args.dst_path, args.scale, args.stations, args.years)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"{rows:,} rows -> {args.dst_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import copy
+import time
+
+import numpy as np
+
+# Atribut yang bisa difilter dari sidebar (sesuai analisis di notebook)
+FILTER_DIMENSIONS = ["weathersit", "workingday", "holiday", "season"]
+
+
+def filter_key(filters):
+    # Bentuk kanonik filter untuk kunci cache; atribut tanpa nilai terpilih diabaikan
+    return tuple((col, tuple(sorted(int(value) for value in values)))
+                 for col, values in sorted(filters.items()) if values)
+
+
+class BitmapIndex:
+    # Satu bitmap ter-pack (1 bit per baris) per (kolom, nilai), dibangun sekali per versi data.
+    # Kombinasi filter apa pun cukup OR antar nilai satu kolom lalu AND antar kolom di atas
+    # byte bitmap, tanpa membuat mask pandas baru atas seluruh frame.
+
+    def __init__(self, df, columns=FILTER_DIMENSIONS):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        for col in columns:
+            if col not in df.columns:
+                continue
+            values = df[col].to_numpy()
+            self.bitmaps[col] = {int(value): np.packbits(values == value) for value in np.unique(values)}
+
+    def extended(self, df, split):
+        # Versi baru df (baris [0, split) sama dengan versi lama): byte bitmap yang penuh berisi
+        # baris lama dipakai ulang, hanya baris sesudahnya yang di-pack
+        keep = split // 8
+        index = copy.copy(self)
+        index.n_rows = len(df)
+        index.bitmaps = {}
+        for col, bitmaps in self.bitmaps.items():
+            values = df[col].to_numpy()[keep * 8:]
+            index.bitmaps[col] = {}
+            for value in sorted(set(bitmaps) | {int(value) for value in np.unique(values)}):
+                head = bitmaps[value][:keep] if value in bitmaps else np.zeros(keep, dtype=np.uint8)
+                index.bitmaps[col][value] = np.concatenate([head, np.packbits(values == value)])
+        return index
+
+    def resolve(self, filters):
+        # Bitmap ter-pack baris yang lolos semua filter; None bila tidak ada filter aktif
+        packed = None
+        for col, values in filter_key(filters):
+            if col not in self.bitmaps:
+                continue
+            selected = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+            for value in values:
+                bitmap = self.bitmaps[col].get(value)
+                if bitmap is not None:
+                    np.bitwise_or(selected, bitmap, out=selected)
+            if packed is None:
+                packed = selected
+            else:
+                np.bitwise_and(packed, selected, out=packed)
+        return packed
+
+    def count(self, filters):
+        packed = self.resolve(filters)
+        return self.n_rows if packed is None else int(np.bitwise_count(packed).sum())
+
+    def rows(self, filters):
+        # Posisi baris (terurut) yang lolos filter; None bila tidak ada filter aktif
+        packed = self.resolve(filters)
+        if packed is None:
+            return None
+        return np.flatnonzero(np.unpackbits(packed, count=self.n_rows))
+
+    @property
+    def nbytes(self):
+        return sum(bitmap.nbytes for bitmaps in self.bitmaps.values() for bitmap in bitmaps.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time bitmap-index filters against pandas masks on a day/hour CSV")
+    parser.add_argument("csv_path")
+    parser.add_argument("--filter", nargs="*", default=["weathersit=1,2", "workingday=1"],
+                        help="column=value[,value...]; values of one column are OR-ed, columns are AND-ed")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from loader import read_dataset
+    df = read_dataset(args.csv_path)
+    filters = {}
+    for item in args.filter:
+        col, values = item.split("=")
+        filters[col] = [int(value) for value in values.split(",")]
+
+    started = time.perf_counter()
+    index = BitmapIndex(df)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        rows = index.rows(filters)
+    bitmap_ms = (time.perf_counter() - started) * 1000 / args.repeat
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        mask = np.ones(len(df), dtype=bool)
+        for col, values in filters.items():
+            mask &= df[col].isin(values).to_numpy()
+    pandas_ms = (time.perf_counter() - started) * 1000 / args.repeat
+
+    assert np.array_equal(rows, np.flatnonzero(mask))
+    print(f"{len(df):,} rows, {len(rows):,} match {filter_key(filters)}")
+    print(f"bitmap index {index.nbytes / 1024:.0f} KiB built in {build_ms:.1f} ms; "
+          f"resolve {bitmap_ms:.3f} ms vs pandas masks {pandas_ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
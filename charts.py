@@ -0,0 +1,216 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from trends import TREND_LABELS
+
+# matplotlib/seaborn baru di-import (dan diberi tema) saat gambar pertama dirender
+plt = None
+sns = None
+_import_lock = threading.Lock()
+# pyplot tidak thread-safe; sesi dan warmer merender bergantian
+_render_lock = threading.Lock()
+
+HIGHLIGHT = "#90CAF9"
+MUTED = "#D3D3D3"
+
+# Pengaturan gambar per section, sama seperti sebelumnya di dashboard.py
+BAR_SECTIONS = {
+    "weekday": {"y": "weekday", "n_colors": 7, "figsize": (45, 8)},
+    "season": {"y": "season", "n_colors": 4, "figsize": (45, 6)},
+    "mnth": {"y": "mnth", "n_colors": 12, "figsize": (45, 10)},
+    "yr": {"y": "yr", "n_colors": 2, "figsize": (45, 6)},
+}
+
+SAVEFIG_OPTIONS = {"format": "png", "bbox_inches": "tight", "dpi": 200}
+
+
+def load_plotting():
+    global plt, sns
+    with _import_lock:
+        if sns is None:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.pyplot as pyplot
+            import seaborn
+            seaborn.set(style='dark')
+            plt, sns = pyplot, seaborn
+
+
+def plot_daily_orders(daily_orders_df):
+    fig, ax = plt.subplots(figsize=(20, 8))
+    ax.plot(
+        daily_orders_df["order_date"],
+        daily_orders_df["total"],
+        marker='o',
+        linewidth=2,
+        color=HIGHLIGHT
+    )
+    # Estimasi sampel: pita 95% CI di sekitar garis
+    if "total_err" in daily_orders_df.columns:
+        ax.fill_between(
+            daily_orders_df["order_date"],
+            daily_orders_df["total"] - daily_orders_df["total_err"],
+            daily_orders_df["total"] + daily_orders_df["total_err"],
+            color=HIGHLIGHT,
+            alpha=0.3,
+            label="95% CI"
+        )
+    overlays = [col for col in TREND_LABELS if col in daily_orders_df.columns]
+    for col in overlays:
+        ax.plot(daily_orders_df["order_date"], daily_orders_df[col], linestyle="--", linewidth=2, label=TREND_LABELS[col])
+    if overlays:
+        ax.legend(fontsize=15)
+    ax.tick_params(axis='y', labelsize=15)
+    ax.tick_params(axis='x', labelsize=15)
+    ax.set_title("Total Renter", loc="center", fontsize=20)
+    return fig
+
+
+def plot_renter_bars(df, y, n_colors, figsize):
+    fig, ax = plt.subplots(nrows=1, ncols=3, figsize=figsize)
+
+    colors = [HIGHLIGHT] + [MUTED] * (n_colors - 1)
+    panels = [
+        ("casual", "Casual Renter"),
+        ("registered", "Registered Renter"),
+        ("total", "Total Renter"),
+    ]
+    for i, (x, title) in enumerate(panels):
+        sorted_df = df.sort_values(by=x, ascending=False)
+        sns.barplot(x=x, y=y, data=sorted_df, palette=colors, ax=ax[i])
+        if f"{x}_err" in df.columns:
+            ax[i].errorbar(sorted_df[x], range(len(sorted_df)), xerr=sorted_df[f"{x}_err"], fmt="none",
+                           ecolor="black", elinewidth=3, capsize=10)
+        ax[i].set_ylabel(None)
+        ax[i].set_xlabel("Number of Renter", fontsize=30)
+        ax[i].set_title(title, loc="center", fontsize=30)
+        ax[i].tick_params(axis='y', labelsize=23)
+        ax[i].tick_params(axis='x', labelsize=30)
+
+    for axis in ax:
+        axis.set_xticklabels(axis.get_xticklabels(), rotation=45, ha='right')
+
+    for axis in ax:
+        axis.get_xaxis().set_major_formatter(plt.FuncFormatter(lambda x, loc: "{:,}".format(int(x))))
+
+    return fig
+
+
+def plot_hourly(hourly_df):
+    # Data sudah di-downsample; tanpa marker agar tetap terbaca di resolusi per jam
+    fig, ax = plt.subplots(figsize=(20, 8))
+    ax.plot(
+        hourly_df["order_date"],
+        hourly_df["total"],
+        linewidth=1,
+        color=HIGHLIGHT
+    )
+    ax.tick_params(axis='y', labelsize=15)
+    ax.tick_params(axis='x', labelsize=15)
+    ax.set_title("Total Renter per Hour", loc="center", fontsize=20)
+    return fig
+
+
+def plot_hour_profile(profile_df):
+    fig, ax = plt.subplots(figsize=(20, 8))
+    for weekday, group in profile_df.groupby("weekday", sort=False):
+        ax.plot(group["hr"], group["total"], marker='o', linewidth=2, label=weekday)
+    ax.set_xticks(range(24))
+    ax.set_xlabel("Hour", fontsize=15)
+    ax.tick_params(axis='y', labelsize=15)
+    ax.tick_params(axis='x', labelsize=15)
+    ax.set_title("Average Renter by Hour of Day", loc="center", fontsize=20)
+    ax.legend(fontsize=13)
+    return fig
+
+
+def plot_correlation(corr_df):
+    fig, ax = plt.subplots(figsize=(12, 10))
+    sns.heatmap(corr_df, annot=True, fmt=".2f", cmap="Blues", vmin=-1, vmax=1, ax=ax, annot_kws={"fontsize": 13})
+    ax.tick_params(axis='y', labelsize=15, rotation=0)
+    ax.tick_params(axis='x', labelsize=15)
+    ax.set_title("Correlation", loc="center", fontsize=20)
+    return fig
+
+
+def plot_section(section, df):
+    load_plotting()
+    if section == "daily":
+        return plot_daily_orders(df)
+    if section == "hourly":
+        return plot_hourly(df)
+    if section == "hour_profile":
+        return plot_hour_profile(df)
+    if section == "correlation":
+        return plot_correlation(df)
+    return plot_renter_bars(df, **BAR_SECTIONS[section])
+
+
+def figure_to_png(fig):
+    buf = io.BytesIO()
+    fig.savefig(buf, **SAVEFIG_OPTIONS)
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def frame_digest(df):
+    digest = hashlib.sha1()
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(repr(list(df.dtypes.astype(str))).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    # LRU berbasis ukuran byte: entry paling lama tidak dipakai dibuang saat melebihi budget
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= len(old)
+            self._entries[key] = value
+            self.total_bytes += len(value)
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+render_cache = RenderCache(max_bytes=64 * 1024 * 1024)
+
+
+def render_section_png(section, df, cache=render_cache):
+    key = (section, frame_digest(df))
+    png = cache.get(key)
+    if png is None:
+        with _render_lock:
+            png = figure_to_png(plot_section(section, df))
+        cache.put(key, png)
+    return png
@@ -0,0 +1,247 @@
+import argparse
+import functools
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from aggregate import DIMENSIONS, MEASURES, create_aggregates, year_labels
+from bitmap import BitmapIndex, filter_key
+from loader import snapshot_path
+from moments import MOMENT_CELL_COLUMNS, WEATHER_COLUMNS, has_moments, moment_sums
+from snapshot import COMPACT_DTYPES, read_snapshot, snapshot_is_current
+from timeindex import TimeIndex
+
+CUBE_DIMENSIONS = ["season", "yr", "mnth", "weekday", "weathersit", "workingday", "holiday"]
+# Dinaikkan saat kolom sel berubah, supaya cube lama di disk dibangun ulang
+CUBE_FORMAT = "2"
+
+CATEGORY_LABELS = dict(DIMENSIONS)
+CATEGORY_LABELS.update({
+    "weathersit": {
+        1: "Clear",
+        2: "Mist",
+        3: "Light Rain/Snow",
+        4: "Heavy Rain/Snow",
+    },
+    "workingday": {
+        0: "Weekend/Holiday",
+        1: "Working Day",
+    },
+    "holiday": {
+        0: "Not Holiday",
+        1: "Holiday",
+    },
+})
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def build_cube(df, partition_cols=()):
+    # Sel cube: bucket hari x kombinasi kategori, berisi jumlah ukuran dan jumlah baris.
+    # partition_cols (mis. station) menjadi kunci paling depan, sehingga sel terurut per partisi.
+    keys = ([df[col] for col in partition_cols] + [df["order_date"].dt.floor("D").rename("order_date")]
+            + [df[dim] for dim in CUBE_DIMENSIONS])
+    grouped = df.groupby(keys, sort=True, observed=True)
+    cube = grouped[MEASURES].sum().astype(np.int64)
+    cube["count"] = grouped.size().astype(np.int32)
+    # Statistik momen (korelasi cuaca vs penyewa) ikut dilipat per sel, jadi rentang, stasiun
+    # dan filter kategori mana pun bisa dihitung dari sel tanpa membaca baris mentah lagi
+    if has_moments(df):
+        for name, values in moment_sums(df, grouped.ngroup().to_numpy(), len(cube)).items():
+            cube[name] = values
+    return cube.reset_index().astype({dim: COMPACT_DTYPES[dim] for dim in CUBE_DIMENSIONS})
+
+
+def cell_values(cells):
+    # Kolom sel yang dijumlahkan saat sel digabung
+    return MEASURES + ["count"] + [col for col in MOMENT_CELL_COLUMNS if col in cells.columns]
+
+
+def write_cube(cube, cube_path, source_stamp, row_group_size=None):
+    os.makedirs(os.path.dirname(cube_path) or ".", exist_ok=True)
+    table = pa.Table.from_pandas(cube, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"source_stamp": ",".join(str(v) for v in source_stamp).encode(),
+        b"cube_format": CUBE_FORMAT.encode(),
+    })
+    tmp_path = cube_path + ".tmp"
+    pq.write_table(table, tmp_path, row_group_size=row_group_size)
+    os.replace(tmp_path, cube_path)
+
+
+def _stored_stamp(cube_path):
+    try:
+        metadata = pq.read_schema(cube_path).metadata or {}
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+    stamp = metadata.get(b"source_stamp")
+    if metadata.get(b"cube_format") != CUBE_FORMAT.encode():
+        return None
+    return tuple(int(v) for v in stamp.decode().split(",")) if stamp else None
+
+
+def _source_stamp(csv_path):
+    stat = os.stat(csv_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class Cube:
+
+    def __init__(self, cells, index=None):
+        self.cells = cells
+        self.index = TimeIndex(cells) if index is None else index
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+        self._aggregates = functools.lru_cache(maxsize=256)(self._build_aggregates)
+        self._filtered = functools.lru_cache(maxsize=16)(self._build_filtered)
+
+    @property
+    def min_date(self):
+        return self.index.min_date
+
+    @property
+    def max_date(self):
+        return self.index.max_date
+
+    def slice(self, start_date=None, end_date=None):
+        if start_date is None and end_date is None:
+            return self.index.df
+        return self.index.slice(start_date or self.min_date, end_date or self.max_date)
+
+    def totals(self, start_date, end_date):
+        return self.index.totals(start_date, end_date)
+
+    def last_year_totals(self, start_date, end_date):
+        # Total rentang yang sama setahun sebelumnya; None bila belum tercakup data
+        start = pd.Timestamp(start_date) - pd.DateOffset(years=1)
+        end = pd.Timestamp(end_date) - pd.DateOffset(years=1)
+        if start < self.min_date.normalize():
+            return None
+        return self.totals(start, end)
+
+    def _build_aggregates(self, start_date, end_date):
+        return create_aggregates(self.slice(start_date, end_date))
+
+    def aggregates(self, start_date, end_date):
+        # Dibagi antar sesi dan di-cache per rentang (per hari), jangan diubah in-place
+        return self._aggregates(pd.Timestamp(start_date).date(), pd.Timestamp(end_date).date())
+
+    def derived(self, key, build):
+        # Objek turunan dari sel cube, hidup selama versi cube ini dipakai
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = build(self.cells)
+            return self._derived[key]
+
+    def extended(self, cells, since):
+        # Cube versi setelah append: sel sebelum hari `since` sama dengan cube ini. TimeIndex dan
+        # objek turunan yang punya extended() diperpanjang dari sel itu, bukan dibangun ulang;
+        # cache agregat per rentang dan sub-cube filter dimulai kosong.
+        split = int(cells["order_date"].searchsorted(since, side="left"))
+        cube = Cube(cells, self.index.extended(cells, split))
+        with self._derived_lock:
+            derived = dict(self._derived)
+        cube._derived = {key: value.extended(cells, split) for key, value in derived.items() if hasattr(value, "extended")}
+        return cube
+
+    def _build_filtered(self, key):
+        # Bitmap per nilai kategori dibangun sekali per cube; sel terpilih tetap terurut waktu
+        bitmaps = self.derived("bitmaps", lambda cells: BitmapIndex(self.index.df))
+        return Cube(self.index.df.take(bitmaps.rows(dict(key))).reset_index(drop=True))
+
+    def filtered(self, filters):
+        # Sub-cube untuk kombinasi filter kategori, di-cache per kombinasi
+        key = filter_key(filters)
+        return self._filtered(key) if key else self
+
+    def category_labels(self, dim):
+        # Label tahun diturunkan dari tanggal sel (tahun hasil append ikut berlabel benar)
+        if dim == "yr":
+            return self.derived("year_labels", year_labels)
+        return CATEGORY_LABELS[dim]
+
+    def rollup(self, by, start_date=None, end_date=None):
+        cells = self.slice(start_date, end_date)
+        rolled = cells.groupby(list(by), sort=True)[MEASURES + ["count"]].sum()
+        for col in MEASURES:
+            rolled[f"{col}_mean"] = rolled[col] / rolled["count"]
+        return rolled.reset_index()
+
+
+def load_cube(csv_path, cube_path, snapshot_dir=None):
+    # Cube dibangun sekali per refresh data lalu disimpan ke disk di samping snapshot
+    stamp = _source_stamp(csv_path)
+    with _lock:
+        entry = _cache.get(cube_path)
+        if entry is not None and entry["stamp"] == stamp:
+            return entry["cube"]
+
+        # CSV hanya bertambah lewat ingest.py append: cukup baris barunya yang dilipat ke cube
+        # di memori (file cube sudah ditulis ulang oleh proses append)
+        if entry is not None:
+            from ingest import appended_rows, merge_cells
+            new_rows = appended_rows(csv_path, entry["stamp"], stamp)
+            if new_rows is not None and len(new_rows):
+                new_cells = build_cube(new_rows)
+                cube = entry["cube"].extended(merge_cells(entry["cube"].cells, new_cells), new_cells["order_date"].iloc[0])
+                _cache[cube_path] = {"stamp": stamp, "cube": cube}
+                return cube
+
+        if _stored_stamp(cube_path) == stamp:
+            cells = pq.read_table(cube_path).to_pandas()
+        else:
+            if snapshot_dir and snapshot_is_current(snapshot_dir, csv_path):
+                cells = build_cube(read_snapshot(snapshot_dir, columns=CUBE_DIMENSIONS + MEASURES + WEATHER_COLUMNS))
+            else:
+                # Baca CSV per chunk supaya file besar tidak dimuat utuh ke memori
+                from ingest import build_cube_chunked
+                cells = build_cube_chunked(csv_path)
+            try:
+                write_cube(cells, cube_path, stamp)
+            except OSError:
+                # Direktori read-only: tetap pakai cube di memori
+                pass
+
+        cube = Cube(cells)
+        _cache[cube_path] = {"stamp": stamp, "cube": cube}
+        return cube
+
+
+def store_cube(cube_path, cube, source_stamp):
+    # Dipakai append: tulis ulang file cube dan ganti entry cache di proses ini dengan cube
+    # yang sudah diperpanjang (lihat Cube.extended)
+    write_cube(cube.cells, cube_path, source_stamp)
+    with _lock:
+        _cache[cube_path] = {"stamp": source_stamp, "cube": cube}
+    return cube
+
+
+def label_categories(df, columns):
+    df = df.copy()
+    for col in columns:
+        labels = year_labels(df) if col == "yr" and "order_date" in df.columns else CATEGORY_LABELS.get(col)
+        if labels is not None:
+            df[col] = df[col].map(lambda key: labels.get(key, str(key)))
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the on-disk data cube for day.csv / hour.csv")
+    parser.add_argument("csv_path")
+    parser.add_argument("cube_path", nargs="?", default=None, help="default: the dashboard's cube for csv_path")
+    parser.add_argument("--snapshot-dir", default=None, help="default: the dashboard's snapshot for csv_path")
+    args = parser.parse_args()
+    args.cube_path = args.cube_path or snapshot_path(args.csv_path, "_cube.parquet")
+
+    cube = load_cube(args.csv_path, args.cube_path, args.snapshot_dir or snapshot_path(args.csv_path))
+    print(f"{len(cube.cells)} cells, {cube.min_date.date()} .. {cube.max_date.date()} -> {args.cube_path}")
+
+
+if __name__ == "__main__":
+    main()
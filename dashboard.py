@@ -1,143 +1,56 @@
+import os
+import uuid
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
-from babel.numbers import format_currency
-sns.set(style='dark')
-
-def create_daily_orders_df(df):
-    daily_orders_df = df.resample(rule='D', on='order_date').agg({
-        "casual": "sum",
-        "registered": "sum",
-        "cnt": "sum"
-    })
-    daily_orders_df = daily_orders_df.reset_index()
-    daily_orders_df.rename(columns={
-        "cnt": "total",
-    }, inplace=True)
-    
-    return daily_orders_df
-
-
-def create_weekday_df(df):
-    weekday_resampled = df.resample(rule='D', on='order_date').sum()
-    weekday_df = weekday_resampled.groupby("weekday").agg({
-        "casual": "sum",
-        "registered": "sum",
-        "cnt": "sum"
-    }).round(0)
-
-    weekday_df = weekday_df.reset_index()
-    weekday_df.rename(columns={
-        "cnt": "total",
-    }, inplace=True)
-
-    day_dict = {
-    0: "Sunday",
-    1: "Monday",
-    2: "Tuesday",
-    3: "Wednesday",
-    4: "Thursday",
-    5: "Friday",
-    6: "Saturday"
-    }
-    
-    weekday_df["weekday"] = weekday_df["weekday"].replace(day_dict)
-    weekday_df["weekday"] = weekday_df["weekday"].astype(str)
-
-    return weekday_df
-
-
-def create_season_df(df):
-    season_resampled = df.resample(rule='D', on='order_date').sum()
-    season_df = season_resampled.groupby("season").agg({
-        "casual": "sum",
-        "registered": "sum",
-        "cnt": "sum"
-    }).round(0)
-
-    season_df = season_df.reset_index()
-    season_df.rename(columns={
-        "cnt": "total",
-    }, inplace=True)
-
-    season_dict = {
-    1: "Spring",
-    2: "Summer",
-    3: "Fall",
-    4: "Winter",
-    }
-    
-    season_df["season"] = season_df["season"].replace(season_dict)
-    season_df["season"] = season_df["season"].astype(str)
-
-    return season_df
-
-
-def create_month_df(df):
-    month_resampled = df.resample(rule='D', on='order_date').sum()
-    month_df = month_resampled.groupby("mnth").agg({
-        "casual": "sum",
-        "registered": "sum",
-        "cnt": "sum"
-    }).round(0)
-
-    month_df = month_df.reset_index()
-    month_df.rename(columns={
-        "cnt": "total",
-    }, inplace=True)
-
-    month_dict = {
-    1: "Jan",
-    2: "Feb",
-    3: "Mar",
-    4: "Apr",
-    5: "May",
-    6: "June",
-    7: "July",
-    8: "Aug",
-    9: "Sep",
-    10: "Oct",
-    11: "Nov",
-    12: "Dec",
-    }
-    
-    month_df["mnth"] = month_df["mnth"].replace(month_dict)
-    month_df["mnth"] = month_df["mnth"].astype(str)
-
-    return month_df
-
-
-def create_year_df(df):
-    year_resampled = df.resample(rule='D', on='order_date').sum()
-    year_df = year_resampled.groupby("yr").agg({
-        "casual": "sum",
-        "registered": "sum",
-        "cnt": "sum"
-    })
-
-    year_df = year_df.reset_index()
-    year_df.rename(columns={
-        "cnt": "total",
-    }, inplace=True)
-
-    year_dict = {
-    0: "2011",
-    1: "2012"
-    }
-    
-    year_df["yr"] = year_df["yr"].replace(year_dict)
-    year_df["yr"] = year_df["yr"].astype(str)
-
-    return year_df
-
-
-all_df = pd.read_csv("day.csv")
-all_df["dteday"] = pd.to_datetime(all_df["dteday"])
-all_df = all_df.rename(columns={"dteday": "order_date"})
-
-min_date = all_df["order_date"].min()
-max_date = all_df["order_date"].max()
+from aggregate import MEASURES, create_hour_profile_df, create_hourly_df
+from approx import estimate_aggregates, needs_approximation
+from bitmap import FILTER_DIMENSIONS, BitmapIndex, filter_key
+from charts import render_section_png
+from cube import CATEGORY_LABELS, load_cube
+from downsample import downsample_frame
+from interactive_charts import section_charts
+from loader import cached_frames, load_dataset, load_derived, load_selection, snapshot_path
+from memory import memory_report
+from moments import RangeMoments
+from snapshot import read_snapshot, read_snapshot_meta, snapshot_is_current
+from stations import STATION_COL, load_station_cube
+from timeindex import TimeIndex
+from timing import StageTimer
+from trends import TREND_LABELS, WINDOWS, Trends
+from validate import failed_checks, load_report
+from warmup import start_warmer
+
+
+# DASHBOARD_DATA bisa diarahkan ke CSV multi-stasiun (kolom station) untuk memunculkan pilihan stasiun
+DATA_PATH = os.environ.get("DASHBOARD_DATA", "day.csv")
+SNAPSHOT_DIR = snapshot_path(DATA_PATH)
+CUBE_PATH = snapshot_path(DATA_PATH, "_cube.parquet")
+STATION_CUBE_PATH = snapshot_path(DATA_PATH, "_station_cube.parquet")
+# Tab Hourly mengikuti dataset terpilih bila dataset itu sendiri per jam (kolom hr); selain itu
+# memakai DASHBOARD_HOUR_DATA (bawaan data/hour.csv, satu seri global)
+HOUR_DATA_PATH = (DATA_PATH if "hr" in pd.read_csv(DATA_PATH, nrows=0).columns
+                  else os.environ.get("DASHBOARD_HOUR_DATA", "data/hour.csv"))
+MAX_CHART_POINTS = 2000
+NO_MATCH = "No data matches the selected filters."
+FILTER_TITLES = {"weathersit": "Weather", "workingday": "Working Day", "holiday": "Holiday", "season": "Season"}
+
+# Durasi tiap tahap per rerun; ditulis ke log JSON-lines dan panel diagnostik (?diagnostics=1)
+session_id = st.session_state.setdefault("session_id", uuid.uuid4().hex)
+timer = StageTimer(session_id)
+
+# Cube dibangun sekali per refresh data (python cube.py day.csv),
+# setiap rerun hanya slicing dan roll-up di atas cube. Cube dan dataset di cache modul
+# dibagi semua sesi dalam proses; slice per sesi adalah view tanpa salinan.
+with timer.stage("load_cube"):
+    station_cube = load_station_cube(DATA_PATH, STATION_CUBE_PATH)
+    # Data tanpa kolom station (day.csv): satu seri global seperti sebelumnya
+    if station_cube is None:
+        all_cube = load_cube(DATA_PATH, CUBE_PATH, SNAPSHOT_DIR)
+        min_date, max_date = all_cube.min_date, all_cube.max_date
+    else:
+        # Rollup semua stasiun baru dibuat saat dibutuhkan (lihat exact_cube)
+        min_date, max_date = station_cube.min_date, station_cube.max_date
  
 with st.sidebar:
     # Menambahkan logo perusahaan
@@ -147,6 +60,15 @@ with st.sidebar:
     Bike Sharing Dashboard
     """
 )
+
+    # Kosong = semua stasiun
+    stations = []
+    progressive = False
+    if station_cube is not None:
+        stations = st.multiselect("Station", station_cube.stations, placeholder="All stations")
+        progressive = st.toggle("Approximate first", value=True,
+                                help="Large station selections show stratified-sample estimates (95% CI) "
+                                     "until the exact rollup is ready")
     
     # Mengambil start_date & end_date dari date_input
     start_date, end_date = st.date_input(
@@ -155,212 +77,365 @@ with st.sidebar:
         value=[min_date, max_date]
     )
 
-main_df = all_df[(all_df["order_date"] >= str(start_date)) & 
-                (all_df["order_date"] <= str(end_date))]
-
-daily_orders_df = create_daily_orders_df(main_df)
-weekday_df = create_weekday_df(main_df)
-season_df = create_season_df(main_df)
-month_df = create_month_df(main_df)
-year_df = create_year_df(main_df)
-
+    # Filter kategori, bebas dikombinasikan dengan rentang waktu: nilai dalam satu atribut
+    # digabung OR, antar atribut AND (diselesaikan lewat bitmap index, lihat bitmap.py)
+    with st.expander("Filters", expanded=True):
+        filters = {}
+        for dim in FILTER_DIMENSIONS:
+            labels = CATEGORY_LABELS[dim]
+            filters[dim] = st.multiselect(FILTER_TITLES[dim], list(labels), format_func=labels.get, placeholder="All")
+    active_filters = filter_key(filters)
+
+    # Interactive: grafik digambar di browser (Vega-Lite), Image: dirender server dengan matplotlib
+    chart_backend = st.radio("Chart", ["Interactive", "Image"], horizontal=True)
+
+    # Validasi data hanya dijalankan sekali per versi file (laporan di snapshot/day_<digest>_quality.json)
+    with timer.stage("quality"):
+        quality = load_report(DATA_PATH)
+    quality_icon = {"ok": ":white_check_mark:", "warning": ":warning:", "error": ":x:"}[quality["status"]]
+    with st.expander(f"Data quality {quality_icon}"):
+        st.caption(f"{quality['rows']:,} rows, {len(failed_checks(quality))} of {len(quality['checks'])} checks failed")
+        st.dataframe(pd.DataFrame(quality["checks"]).set_index("check"))
+
+
+resolved = {}
+
+
+def exact_cube():
+    # Subset stasiun digabung dari rollup per stasiun (paralel per partisi, di-cache per subset).
+    # None bila filter tidak menyisakan sel; section dari data mentah (Hourly) tetap jalan.
+    if "cube" not in resolved:
+        with timer.stage("stations"):
+            cube = all_cube if station_cube is None else station_cube.subset(stations)
+        with timer.stage("filters"):
+            cube = cube.filtered(filters)
+        resolved["cube"] = cube if len(cube.cells) else None
+    return resolved["cube"]
+
+
+# Subset besar yang belum di-cache: estimasi sampel per strata stasiun dalam budget waktu tetap,
+# ditampilkan dulu lalu diganti di tempat begitu rollup eksak selesai. Sampel per stasiun tidak
+# memperhitungkan filter kategori, jadi estimasi hanya dipakai tanpa filter.
+estimate = None
+if progressive and not active_filters and needs_approximation(station_cube, stations):
+    with timer.stage("approx"):
+        estimate = estimate_aggregates(station_cube, stations, start_date, end_date)
+
+
+def approximate_pending():
+    return estimate is not None and not station_cube.is_cached(stations)
+
+
+def show_marker(approximate):
+    if approximate:
+        st.caption(f":orange-badge[≈ Approximate] sampled {estimate['sampled']} of {estimate['stations']} stations, "
+                   "error bars show the 95% confidence interval")
+    elif progressive:
+        st.caption(":green-badge[Exact] all selected stations")
+
+
+def load_for_stations(path, key, build):
+    # Objek turunan data mentah untuk stasiun dan filter kategori terpilih; file tanpa kolom
+    # station tidak difilter per stasiun
+    subset = ()
+    if stations and STATION_COL in load_dataset(path).columns:
+        subset = tuple(sorted(stations))
+    if not subset and not active_filters:
+        return load_derived(path, key, build)
+
+    bitmaps = load_derived(path, "bitmaps", BitmapIndex)
+
+    def build_selection(df):
+        rows = bitmaps.rows(filters)
+        if rows is not None:
+            df = df.take(rows)
+        if subset:
+            df = df[df[STATION_COL].isin(subset)]
+        return build(df)
+
+    # Satu objek per pilihan sebesar data mentah; hanya beberapa pilihan terakhir yang disimpan
+    return load_selection(path, (key, subset, active_filters), build_selection)
+
+
+def show_section(section, df):
+    if chart_backend == "Interactive":
+        with timer.stage(f"chart:{section}"):
+            charts = section_charts(section, df)
+        with timer.stage(f"send:{section}"):
+            for col, chart in zip(st.columns(len(charts)), charts):
+                col.altair_chart(chart)
+    else:
+        with timer.stage(f"render:{section}"):
+            png = render_section_png(section, df)
+        with timer.stage(f"send:{section}"):
+            st.image(png)
+
+
+# Agregasi baru diambil saat ada section yang dibuka; hasilnya di-cache per rentang di cube
+aggregates = {}
+
+
+def section_df(section):
+    if not aggregates:
+        with timer.stage("aggregates"):
+            aggregates.update(exact_cube().aggregates(start_date, end_date))
+    return aggregates[section]
+
+
+def daily_trends(daily_orders_df):
+    # Rolling dan year-over-year dihitung sekali per versi data atas seluruh riwayat,
+    # tiap rentang hanya slicing (di-cache per rentang)
+    with timer.stage("trends"):
+        trends = exact_cube().derived("trends", Trends)
+
+    cols = st.columns(len(WINDOWS))
+    for col, window in zip(cols, WINDOWS):
+        current, previous = trends.window_totals(end_date, window)
+        if pd.isna(current):
+            continue
+        delta = None if pd.isna(previous) else int(current - previous)
+        col.metric(f"Last {window} Days", value=int(current), delta=delta,
+                   help="Delta: same window one year earlier")
+
+    overlays = st.multiselect("Trend", list(TREND_LABELS), format_func=TREND_LABELS.get)
+    if not overlays:
+        return daily_orders_df
+    series = trends.series(start_date, end_date)
+    trend_df = series[["order_date"] + overlays].astype({"order_date": daily_orders_df["order_date"].dtype})
+    return daily_orders_df.merge(trend_df, on="order_date", how="left")
+
+
+@st.fragment
+def detail_section(section, title, note):
+    st.subheader(title)
+    slot = st.empty()
+    if approximate_pending():
+        with slot.container():
+            show_marker(True)
+            show_section(section, estimate["aggregates"][section])
+    if exact_cube() is None:
+        slot.warning(NO_MATCH)
+        return
+    df = section_df(section)
+    with slot.container():
+        show_marker(False)
+        if section == "daily":
+            df = daily_trends(df)
+        show_section(section, df)
+    st.write("<p style='text-align:justify;'>Interpretasi di atas tergantung dari rentang yang diinginkan, namun untuk penjelasan mengenai awal hingga akhir rentang data adalah sebagai berikut : </p>", unsafe_allow_html=True)
+    st.write(note, unsafe_allow_html=True)
+
+
+def hour_range():
+    # Snapshot Parquet hour.csv (python snapshot.py data/hour.csv): hanya partisi bulan rentang
+    # terpilih dan kolom yang dipakai yang dibaca, dengan dtype ringkas. CSV penuh di-parse
+    # hanya bila snapshot belum ada atau sudah usang.
+    hour_snapshot = snapshot_path(HOUR_DATA_PATH)
+    if not snapshot_is_current(hour_snapshot, HOUR_DATA_PATH):
+        return load_for_stations(HOUR_DATA_PATH, "time_index", TimeIndex).slice(start_date, end_date)
+
+    available = read_snapshot_meta(hour_snapshot)["columns"]
+    columns = [col for col in ["weekday", "hr", STATION_COL, *FILTER_DIMENSIONS, *MEASURES] if col in available]
+    df = read_snapshot(hour_snapshot, start_date, end_date, columns)
+    mask = None
+    if stations and STATION_COL in df.columns:
+        mask = df[STATION_COL].isin(stations).to_numpy()
+    for col, values in active_filters:
+        selected = df[col].isin(values).to_numpy()
+        mask = selected if mask is None else mask & selected
+    return df if mask is None else df[mask]
+
+
+@st.fragment
+def hourly_section():
+    st.subheader('Renter per Hour')
+
+    with timer.stage("hour_load"):
+        hour_df = hour_range()
+        hour_issues = failed_checks(load_report(HOUR_DATA_PATH))
+    if HOUR_DATA_PATH != DATA_PATH:
+        scope = " for all stations (no station column)" if stations and STATION_COL not in hour_df.columns else ""
+        st.caption(f"Hourly data from {HOUR_DATA_PATH}{scope}")
+    for check in hour_issues:
+        st.caption(f"Data quality ({HOUR_DATA_PATH}): {check['check']} - {check['failed']:,} ({check['detail']})")
+
+    with timer.stage("hour_profile"):
+        hour_profile_df = create_hour_profile_df(hour_df)
+    show_section("hour_profile", hour_profile_df)
+
+    # Rentang panjang di-downsample (min/max per bucket) supaya grafik maksimal ~2.000 titik
+    with timer.stage("hourly"):
+        hourly_df = downsample_frame(create_hourly_df(hour_df), "total", MAX_CHART_POINTS)
+    show_section("hourly", hourly_df)
+    if len(hourly_df) < len(hour_df):
+        st.caption(f"Showing {len(hourly_df):,} of {len(hour_df):,} hourly points (min/max per bucket)")
+
+
+@st.fragment
+def correlation_section():
+    st.subheader('Weather vs Renter')
+
+    if exact_cube() is None:
+        st.warning(NO_MATCH)
+        return
+
+    # Prefix momen per hari dilipat dari sel cube (stasiun dan filter terpilih) sekali per cube,
+    # tiap rentang hanya O(k^2)
+    with timer.stage("moments"):
+        moments = exact_cube().derived("moments", RangeMoments)
+    stat = st.radio("Matrix", ["Correlation", "Covariance"], horizontal=True)
+    if stat == "Correlation":
+        with timer.stage("corr"):
+            corr_df = moments.corr(start_date, end_date).round(4)
+        show_section("correlation", corr_df)
+    else:
+        with timer.stage("cov"):
+            cov_df = moments.cov(start_date, end_date).round(4)
+        st.dataframe(cov_df)
+
+
+@st.fragment
+def breakdown_section():
+    st.subheader('Breakdown by Category')
+    if exact_cube() is None:
+        st.warning(NO_MATCH)
+        return
+
+    breakdown_dims = list(CATEGORY_LABELS)
+    measure_labels = {"cnt": "Total Renter", "casual": "Casual Renter", "registered": "Registered Renter"}
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        row_dim = st.selectbox("Rows", breakdown_dims, index=breakdown_dims.index("mnth"))
+
+    with col2:
+        col_dim = st.selectbox("Columns", breakdown_dims, index=breakdown_dims.index("workingday"))
+
+    with col3:
+        measure = st.selectbox("Renter", list(measure_labels), format_func=measure_labels.get)
+
+    with col4:
+        stat = st.radio("Statistic", ["Sum", "Mean"], horizontal=True)
+
+    value_col = measure if stat == "Sum" else f"{measure}_mean"
+    by = [row_dim] if row_dim == col_dim else [row_dim, col_dim]
+    with timer.stage("rollup"):
+        breakdown_df = exact_cube().rollup(by, start_date, end_date)
+    labels = exact_cube().category_labels
+
+    if len(by) == 1:
+        breakdown_table = breakdown_df.set_index(row_dim)[[value_col]]
+    else:
+        breakdown_table = breakdown_df.pivot(index=row_dim, columns=col_dim, values=value_col)
+        breakdown_table = breakdown_table.rename(columns=labels(col_dim))
+    breakdown_table = breakdown_table.rename(index=labels(row_dim))
+
+    st.dataframe(breakdown_table.round(2))
+
+
+
+YEAR_DELTA_HELP = "Delta: same date range one year earlier"
+METRICS = [("casual", "Total Casual Renter"), ("registered", "Total Registered Renter"), ("cnt", "Total Renter")]
+
+
+def show_metrics(totals, last_year_totals=None, totals_err=None):
+    with metrics_slot.container():
+        show_marker(totals_err is not None)
+        for col, (measure, label) in zip(st.columns(3), METRICS):
+            if totals_err is not None:
+                col.metric(label, value=totals[measure], help=f"± {totals_err[measure]:,.0f} (95% CI)")
+                continue
+            delta = None if last_year_totals is None else totals[measure] - last_year_totals[measure]
+            col.metric(label, value=totals[measure], delta=delta, help=YEAR_DELTA_HELP)
+
+
+def show_exact_metrics():
+    cube = exact_cube()
+    if cube is None:
+        metrics_slot.warning(NO_MATCH)
+        return None
+    with timer.stage("slice"):
+        main_df = cube.slice(start_date, end_date)
+        range_totals = cube.totals(start_date, end_date)
+        last_year_totals = cube.last_year_totals(start_date, end_date)
+    show_metrics(range_totals, last_year_totals)
+    return main_df
 
 
 st.header('Bike Sharing Dashboard :sparkles: :bike: ')
 
-
-st.subheader('Daily Orders')
- 
-col1, col2, col3 = st.columns(3)
- 
-with col1:
-    total_casual = daily_orders_df.casual.sum()
-    st.metric("Total Casual Renter", value=total_casual)
- 
-with col2:
-    total_registered = daily_orders_df.registered.sum()
-    st.metric("Total Registered Renter", value=total_registered)
-
-with col3:
-    total_user = daily_orders_df.total.sum()
-    st.metric("Total Renter", value=total_user)
- 
-
-fig, ax = plt.subplots(figsize=(20, 8))
-ax.plot(
-    daily_orders_df["order_date"],
-    daily_orders_df["total"],
-    marker='o', 
-    linewidth=2,
-    color="#90CAF9"
-)
-ax.tick_params(axis='y', labelsize=15)
-ax.tick_params(axis='x', labelsize=15)
-ax.set_title("Total Renter", loc="center", fontsize=20)
-
- 
-st.pyplot(fig)
-st.write("<p style='text-align:justify;'>Interpretasi di atas tergantung dari rentang yang diinginkan, namun untuk penjelasan mengenai awal hingga akhir rentang data adalah sebagai berikut : </p>", unsafe_allow_html=True)
-st.write("<p style='text-align:justify;'>Ada banyak hal yang dapat mempengaruhi performa penyewaan sepeda, namun jika kita melihat secara sudut pandang tahunan yang dimana kita melihat trending performa setiap bulan, maka hal yang paling mencolok based on data adalah pengaruh musim dan weathersit. Sisanya dijelaskan diluar data yang didapat. Trending cenderung naik dan sangat tinggi di pertengahan tahun dan turun di akhir tahun. namun di akhir tahun, trend tidak sampai jatuh dibawah awal tahun, seharusnya hal ini akan naik kembali apabila perusahaan bekerja keras dan mencari strategi yang efektif untuk mempertahankan sekaligus meningkatkan performa perusahaan bahkan jika kita lihat pada saat EDA, tahun demi tahun perusahaan dapat mengalami kenaikan performa.</p>", unsafe_allow_html=True)
-
-
-st.subheader('More Details about Renter in a Day')
- 
-fig, ax = plt.subplots(nrows=1, ncols=3, figsize=(45, 8))
- 
-colors = ["#90CAF9", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3"]
- 
-sns.barplot(x="casual", y="weekday", data=weekday_df.sort_values(by="casual", ascending=False), palette=colors, ax=ax[0])
-ax[0].set_ylabel(None)
-ax[0].set_xlabel("Number of Renter", fontsize=30)
-ax[0].set_title("Casual Renter", loc="center", fontsize=30)
-ax[0].tick_params(axis='y', labelsize=23)
-ax[0].tick_params(axis='x', labelsize=30)
- 
-sns.barplot(x="registered", y="weekday", data=weekday_df.sort_values(by="registered", ascending=False), palette=colors, ax=ax[1])
-ax[1].set_ylabel(None)
-ax[1].set_xlabel("Number of Renter", fontsize=30)
-ax[1].set_title("Registered Renter", loc="center", fontsize=30)
-ax[1].tick_params(axis='y', labelsize=23)
-ax[1].tick_params(axis='x', labelsize=30)
-
-sns.barplot(x="total", y="weekday", data=weekday_df.sort_values(by="total", ascending=False), palette=colors, ax=ax[2])
-ax[2].set_ylabel(None)
-ax[2].set_xlabel("Number of Renter", fontsize=30)
-ax[2].set_title("Total Renter", loc="center", fontsize=30)
-ax[2].tick_params(axis='y', labelsize=23)
-ax[2].tick_params(axis='x', labelsize=30)
-
-for axis in ax:
-    axis.set_xticklabels(axis.get_xticklabels(), rotation=45, ha='right')
-
-for axis in ax:
-    axis.get_xaxis().set_major_formatter(plt.FuncFormatter(lambda x, loc: "{:,}".format(int(x))))
-
-st.pyplot(fig)
-st.write("<p style='text-align:justify;'>Interpretasi di atas tergantung dari rentang yang diinginkan, namun untuk penjelasan mengenai awal hingga akhir rentang data adalah sebagai berikut : </p>", unsafe_allow_html=True)
-st.write("<p style='text-align:justify;'>Jumlah penyewa sepeda yang paling tinggi di pegang oleh hari jumat, namun apabila kita gali lebih dalam, sebenarnya untuk casual renter atau peminjam spontan / peminjam non-member, cenderung tinggi pada hari sabtu, hal ini bisa diartikan dipengaruhi oleh weekday, dan banyak orang baru atau orang yang spontan saja menyewa sepeda tanpa berlangganan karena memang mereka menyewa hanya untuk vacation, berlibur, dan tidak ada rencana untuk memperpanjang sewa. Sedangkan untuk Registered Renter atau penyewa yang sudah merupakan member dari perusahaan, cenderung rata-rata terbanyak meminjam di hari kamis, hal ini sulit saya jelaskan karena kurangnya informasi yang diberikan.</p>", unsafe_allow_html=True)
-
-
-st.subheader('More Details about Renter in a Season')
- 
-fig, ax = plt.subplots(nrows=1, ncols=3, figsize=(45, 6))
- 
-colors = ["#90CAF9", "#D3D3D3", "#D3D3D3", "#D3D3D3"]
- 
-sns.barplot(x="casual", y="season", data=season_df.sort_values(by="casual", ascending=False), palette=colors, ax=ax[0])
-ax[0].set_ylabel(None)
-ax[0].set_xlabel("Number of Renter", fontsize=30)
-ax[0].set_title("Casual Renter", loc="center", fontsize=30)
-ax[0].tick_params(axis='y', labelsize=23)
-ax[0].tick_params(axis='x', labelsize=30)
- 
-sns.barplot(x="registered", y="season", data=season_df.sort_values(by="registered", ascending=False), palette=colors, ax=ax[1])
-ax[1].set_ylabel(None)
-ax[1].set_xlabel("Number of Renter", fontsize=30)
-ax[1].set_title("Registered Renter", loc="center", fontsize=30)
-ax[1].tick_params(axis='y', labelsize=23)
-ax[1].tick_params(axis='x', labelsize=30)
-
-sns.barplot(x="total", y="season", data=season_df.sort_values(by="total", ascending=False), palette=colors, ax=ax[2])
-ax[2].set_ylabel(None)
-ax[2].set_xlabel("Number of Renter", fontsize=30)
-ax[2].set_title("Total Renter", loc="center", fontsize=30)
-ax[2].tick_params(axis='y', labelsize=23)
-ax[2].tick_params(axis='x', labelsize=30)
-
-for axis in ax:
-    axis.set_xticklabels(axis.get_xticklabels(), rotation=45, ha='right')
-
-for axis in ax:
-    axis.get_xaxis().set_major_formatter(plt.FuncFormatter(lambda x, loc: "{:,}".format(int(x))))
-
-st.pyplot(fig)
-st.write("<p style='text-align:justify;'>Interpretasi di atas tergantung dari rentang yang diinginkan, namun untuk penjelasan mengenai awal hingga akhir rentang data adalah sebagai berikut : </p>", unsafe_allow_html=True)
-st.write("<p style='text-align:justify;'>Jumlah penyewa sepeda yang paling tinggi baik untuk casual user, registered user, maupun keseluruhan dipegang oleh Fall Season. Karena kurangnya informasi, seperti latar tempat dari data yang diambil maka pendapat saya adalah karena Musim gugur identik dengan udara yang lebih segar dan bersih dibandingkan musim panas. Pada musim gugur juga memiliki udara yang sejuk dan bebas polusi membuat bersepeda lebih menyehatkan dan menyenangkan.</p>", unsafe_allow_html=True)
-
-
-st.subheader('More Details about Renter in a Month')
- 
-fig, ax = plt.subplots(nrows=1, ncols=3, figsize=(45, 10))
- 
-colors = ["#90CAF9", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3", "#D3D3D3"]
- 
-sns.barplot(x="casual", y="mnth", data=month_df.sort_values(by="casual", ascending=False), palette=colors, ax=ax[0])
-ax[0].set_ylabel(None)
-ax[0].set_xlabel("Number of Renter", fontsize=30)
-ax[0].set_title("Casual Renter", loc="center", fontsize=30)
-ax[0].tick_params(axis='y', labelsize=23)
-ax[0].tick_params(axis='x', labelsize=30)
- 
-sns.barplot(x="registered", y="mnth", data=month_df.sort_values(by="registered", ascending=False), palette=colors, ax=ax[1])
-ax[1].set_ylabel(None)
-ax[1].set_xlabel("Number of Renter", fontsize=30)
-ax[1].set_title("Registered Renter", loc="center", fontsize=30)
-ax[1].tick_params(axis='y', labelsize=23)
-ax[1].tick_params(axis='x', labelsize=30)
-
-sns.barplot(x="total", y="mnth", data=month_df.sort_values(by="total", ascending=False), palette=colors, ax=ax[2])
-ax[2].set_ylabel(None)
-ax[2].set_xlabel("Number of Renter", fontsize=30)
-ax[2].set_title("Total Renter", loc="center", fontsize=30)
-ax[2].tick_params(axis='y', labelsize=23)
-ax[2].tick_params(axis='x', labelsize=30)
-
-for axis in ax:
-    axis.set_xticklabels(axis.get_xticklabels(), rotation=45, ha='right')
-
-for axis in ax:
-    axis.get_xaxis().set_major_formatter(plt.FuncFormatter(lambda x, loc: "{:,}".format(int(x))))
-
-
-st.pyplot(fig)
-st.write("<p style='text-align:justify;'>Interpretasi di atas tergantung dari rentang yang diinginkan, namun untuk penjelasan mengenai awal hingga akhir rentang data adalah sebagai berikut : </p>", unsafe_allow_html=True)
-st.write("<p style='text-align:justify;'>Jumlah penyewa sepeda yang paling tinggi di pegang oleh bulan Agustus untuk keseluruhan renter dan registered renter, namun untuk casual renter yang meminjam secara spontan / peminjam non-member, mereka cenderung banyak meminjam pada bulan juli</p>", unsafe_allow_html=True)
-
-
-
-st.subheader('More Details about Renter in a Year')
- 
-fig, ax = plt.subplots(nrows=1, ncols=3, figsize=(45, 6))
- 
-colors = ["#90CAF9", "#D3D3D3"]
- 
-sns.barplot(x="casual", y="yr", data=year_df.sort_values(by="casual", ascending=False), palette=colors, ax=ax[0])
-ax[0].set_ylabel(None)
-ax[0].set_xlabel("Number of Renter", fontsize=30)
-ax[0].set_title("Casual Renter", loc="center", fontsize=30)
-ax[0].tick_params(axis='y', labelsize=23)
-ax[0].tick_params(axis='x', labelsize=30)
- 
-sns.barplot(x="registered", y="yr", data=year_df.sort_values(by="registered", ascending=False), palette=colors, ax=ax[1])
-ax[1].set_ylabel(None)
-ax[1].set_xlabel("Number of Renter", fontsize=30)
-ax[1].set_title("Registered Renter", loc="center", fontsize=30)
-ax[1].tick_params(axis='y', labelsize=23)
-ax[1].tick_params(axis='x', labelsize=30)
-
-sns.barplot(x="total", y="yr", data=year_df.sort_values(by="total", ascending=False), palette=colors, ax=ax[2])
-ax[2].set_ylabel(None)
-ax[2].set_xlabel("Number of Renter", fontsize=30)
-ax[2].set_title("Total Renter", loc="center", fontsize=30)
-ax[2].tick_params(axis='y', labelsize=23)
-ax[2].tick_params(axis='x', labelsize=30)
-
-for axis in ax:
-    axis.set_xticklabels(axis.get_xticklabels(), rotation=45, ha='right')
-
-for axis in ax:
-    axis.get_xaxis().set_major_formatter(plt.FuncFormatter(lambda x, loc: "{:,}".format(int(x))))
-
-
-st.pyplot(fig)
-st.write("<p style='text-align:justify;'>Interpretasi di atas tergantung dari rentang yang diinginkan, namun untuk penjelasan mengenai awal hingga akhir rentang data adalah sebagai berikut : </p>", unsafe_allow_html=True)
-st.write("<p style='text-align:justify;'>Jumlah penyewa sepeda mengalami kenaikan dari tahun 2011 ke 2012 untuk semua user </p>", unsafe_allow_html=True)
-
+metrics_slot = st.empty()
+metrics_pending = approximate_pending()
+if metrics_pending:
+    show_metrics(estimate["totals"], totals_err=estimate["totals_err"])
+else:
+    main_df = show_exact_metrics()
+
+# Hanya tab yang sedang dibuka yang dihitung dan digambar
+tabs = st.tabs(["Daily Orders", "Day", "Season", "Month", "Year", "Hourly", "Correlation", "Breakdown"], key="section", on_change="rerun")
+sections = [
+    ("daily", 'Daily Orders',
+     "<p style='text-align:justify;'>Ada banyak hal yang dapat mempengaruhi performa penyewaan sepeda, namun jika kita melihat secara sudut pandang tahunan yang dimana kita melihat trending performa setiap bulan, maka hal yang paling mencolok based on data adalah pengaruh musim dan weathersit. Sisanya dijelaskan diluar data yang didapat. Trending cenderung naik dan sangat tinggi di pertengahan tahun dan turun di akhir tahun. namun di akhir tahun, trend tidak sampai jatuh dibawah awal tahun, seharusnya hal ini akan naik kembali apabila perusahaan bekerja keras dan mencari strategi yang efektif untuk mempertahankan sekaligus meningkatkan performa perusahaan bahkan jika kita lihat pada saat EDA, tahun demi tahun perusahaan dapat mengalami kenaikan performa.</p>"),
+    ("weekday", 'More Details about Renter in a Day',
+     "<p style='text-align:justify;'>Jumlah penyewa sepeda yang paling tinggi di pegang oleh hari jumat, namun apabila kita gali lebih dalam, sebenarnya untuk casual renter atau peminjam spontan / peminjam non-member, cenderung tinggi pada hari sabtu, hal ini bisa diartikan dipengaruhi oleh weekday, dan banyak orang baru atau orang yang spontan saja menyewa sepeda tanpa berlangganan karena memang mereka menyewa hanya untuk vacation, berlibur, dan tidak ada rencana untuk memperpanjang sewa. Sedangkan untuk Registered Renter atau penyewa yang sudah merupakan member dari perusahaan, cenderung rata-rata terbanyak meminjam di hari kamis, hal ini sulit saya jelaskan karena kurangnya informasi yang diberikan.</p>"),
+    ("season", 'More Details about Renter in a Season',
+     "<p style='text-align:justify;'>Jumlah penyewa sepeda yang paling tinggi baik untuk casual user, registered user, maupun keseluruhan dipegang oleh Fall Season. Karena kurangnya informasi, seperti latar tempat dari data yang diambil maka pendapat saya adalah karena Musim gugur identik dengan udara yang lebih segar dan bersih dibandingkan musim panas. Pada musim gugur juga memiliki udara yang sejuk dan bebas polusi membuat bersepeda lebih menyehatkan dan menyenangkan.</p>"),
+    ("mnth", 'More Details about Renter in a Month',
+     "<p style='text-align:justify;'>Jumlah penyewa sepeda yang paling tinggi di pegang oleh bulan Agustus untuk keseluruhan renter dan registered renter, namun untuk casual renter yang meminjam secara spontan / peminjam non-member, mereka cenderung banyak meminjam pada bulan juli</p>"),
+    ("yr", 'More Details about Renter in a Year',
+     "<p style='text-align:justify;'>Jumlah penyewa sepeda mengalami kenaikan dari tahun 2011 ke 2012 untuk semua user </p>"),
+]
+
+for tab, (section, title, note) in zip(tabs, sections):
+    with tab:
+        if tab.open:
+            detail_section(section, title, note)
+
+with tabs[-3]:
+    if tabs[-3].open:
+        hourly_section()
+
+with tabs[-2]:
+    if tabs[-2].open:
+        correlation_section()
+
+with tabs[-1]:
+    if tabs[-1].open:
+        breakdown_section()
+
+# Angka eksak menggantikan estimasi metrik di tempat yang sama
+if metrics_pending:
+    main_df = show_exact_metrics()
 
 
 st.caption('Copyright (c) Dicoding 2024')
 st.caption('Made by // mraflidwis')
 st.caption('Bike Sharing Dataset : [1] Fanaee-T, Hadi, and Gama, Joao, "Event labeling combining ensemble detectors and background knowledge", Progress in Artificial Intelligence (2013): pp. 1-15, Springer Berlin Heidelberg, doi:10.1007/s13748-013-0040-3. ')
 
+# Yang dihitung milik sesi hanya frame yang dibuat rerun ini (bukan view dari data bersama)
+with timer.stage("memory"):
+    cube_frames = [] if exact_cube() is None else [exact_cube().index.df]
+    memory = memory_report(session_id, [] if main_df is None else [main_df], [*cube_frames, *cached_frames()])
+
+timer.flush(start_date=start_date, end_date=end_date, backend=chart_backend, section=st.session_state.get("section"),
+            stations=len(stations), filters=dict(active_filters), approximate=estimate is not None, memory=memory)
+
+# Rentang umum (seluruh data, per tahun, per bulan) dihitung di thread latar setelah
+# halaman pertama selesai, sekali per versi cube per proses (rollup semua stasiun ikut
+# dibangun di thread itu)
+warmer = start_warmer(all_cube if station_cube is None else station_cube)
+
+if st.query_params.get("diagnostics"):
+    with st.sidebar.expander("Diagnostics", expanded=True):
+        st.caption(f"Session {session_id}")
+        stages_df = pd.DataFrame({"ms": timer.stages}).rename_axis("stage")
+        st.dataframe(stages_df.round(2))
+        rss = memory["process_rss"]
+        st.caption(f"Session {memory['session_bytes'] / 2**20:.2f} MB, "
+                   f"shared dataset {memory['shared_bytes'] / 2**20:.2f} MB, "
+                   f"{memory['sessions']} sessions {memory['sessions_bytes'] / 2**20:.2f} MB, "
+                   f"process RSS {'n/a' if rss is None else f'{rss / 2**20:.0f} MB'}")
+        progress = warmer.progress
+        st.caption(f"Warm-up {progress['done']}/{progress['total']} ranges in {progress['elapsed_s']:.1f} s"
+                   + (f", {progress['errors']} failed" if progress["errors"] else ""))
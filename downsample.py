@@ -0,0 +1,24 @@
+import numpy as np
+
+
+def minmax_downsample(y, max_points=2000):
+    # Bagi deret menjadi max_points/2 bucket berurutan dan simpan titik minimum dan
+    # maksimum tiap bucket, jadi puncak dan lembah tetap terlihat di grafik.
+    # Mengembalikan indeks titik yang dipertahankan, terurut menurut waktu.
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    n_buckets = max(1, max_points // 2)
+    bucket = (np.arange(n) * n_buckets) // n
+    order = np.lexsort((y, bucket))
+    starts = np.searchsorted(bucket[order], np.arange(n_buckets), side="left")
+    ends = np.r_[starts[1:], n] - 1
+
+    keep = np.unique(np.concatenate([order[starts], order[ends]]))
+    return keep
+
+
+def downsample_frame(df, y, max_points=2000):
+    keep = minmax_downsample(df[y].to_numpy(), max_points)
+    return df.iloc[keep]
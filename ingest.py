@@ -0,0 +1,224 @@
+import argparse
+import io
+import os
+
+import pandas as pd
+
+from aggregate import MEASURES
+from cube import CUBE_DIMENSIONS, _source_stamp, build_cube, cell_values, load_cube, store_cube, write_cube
+from loader import appended_bytes, prepare_frame, read_appended, record_append, snapshot_path
+from moments import WEATHER_COLUMNS
+from snapshot import COMPACT_DTYPES, append_snapshot
+from validate import load_report
+
+# Perkiraan memori per baris saat parsing chunk CSV (termasuk overhead parser pandas dan
+# nilai float64 untuk statistik momen)
+ROW_BYTES = 320
+DEFAULT_MEMORY_MB = 64
+
+CUBE_KEYS = ["order_date"] + CUBE_DIMENSIONS
+
+
+def chunk_rows_for_budget(memory_mb):
+    return max(1_000, memory_mb * 1024 * 1024 // ROW_BYTES)
+
+
+def _read_options(header, extra_cols=()):
+    # Hanya kolom yang dibutuhkan rollup yang di-parse, langsung dengan dtype ringkas
+    needed = ["dteday", "hr"] + CUBE_DIMENSIONS + MEASURES + WEATHER_COLUMNS + list(extra_cols)
+    usecols = [col for col in header if col in needed]
+    return {"usecols": usecols, "dtype": {col: COMPACT_DTYPES[col] for col in usecols if col in COMPACT_DTYPES}}
+
+
+def iter_chunks(csv_path, chunk_rows, extra_cols=()):
+    options = _read_options(pd.read_csv(csv_path, nrows=0).columns, extra_cols)
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, **options):
+        yield prepare_frame(chunk)
+
+
+def appended_rows(csv_path, old_stamp, stamp, extra_cols=()):
+    # Baris yang ditambahkan append antara dua versi CSV (lihat loader.record_append), di-parse
+    # seperti chunk build; None bila perubahan file bukan append yang tercatat
+    appended = appended_bytes(csv_path, old_stamp, stamp)
+    if appended is None:
+        return None
+    header, data = appended
+    options = _read_options(pd.read_csv(io.BytesIO(header), nrows=0).columns, extra_cols)
+    return prepare_frame(read_appended(header, data, **options))
+
+
+def combine_cells(partials, keys=CUBE_KEYS):
+    # Kolom partisi yang tidak ada di keys ikut dijumlahkan habis (merge antar partisi)
+    cells = pd.concat(partials, ignore_index=True)
+    combined = cells.groupby(list(keys), sort=True, observed=True)[cell_values(cells)].sum().reset_index()
+    dtypes = partials[0].dtypes
+    return combined.astype({col: dtypes[col] for col in combined.columns})
+
+
+def build_cube_chunked(csv_path, memory_mb=DEFAULT_MEMORY_MB, partition_cols=(), stats=None):
+    # Baris mentah tidak pernah dimuat sekaligus: tiap chunk dilipat ke sel cube
+    # (bucket hari x kategori), lalu sel parsial digabung. Penggabungan geometris: sel parsial
+    # baru digabung setelah melebihi budget dan ukuran hasil gabungan terakhir, jadi cube yang
+    # lebih besar dari satu chunk (banyak stasiun) tidak di-group ulang di setiap chunk.
+    chunk_rows = chunk_rows_for_budget(memory_mb)
+    keys = list(partition_cols) + CUBE_KEYS
+    stats = {} if stats is None else stats
+    stats.update(chunks=0, merges=0, merged_rows=0)
+    merged = None
+    partials = []
+    partial_rows = 0
+    for chunk in iter_chunks(csv_path, chunk_rows, partition_cols):
+        cells = build_cube(chunk, partition_cols)
+        stats["chunks"] += 1
+        partials.append(cells)
+        partial_rows += len(cells)
+        if partial_rows > max(chunk_rows, 0 if merged is None else len(merged)):
+            merged = _merge_partials(merged, partials, keys, stats)
+            partials = []
+            partial_rows = 0
+
+    if merged is None and not partials:
+        raise ValueError(f"{csv_path} has no rows")
+    if partials:
+        merged = _merge_partials(merged, partials, keys, stats)
+    return merged
+
+
+def _merge_partials(merged, partials, keys, stats):
+    if merged is not None:
+        partials = [merged] + partials
+    # Satu chunk saja sudah berupa sel tergabung dan terurut
+    if len(partials) == 1:
+        return partials[0]
+    stats["merges"] += 1
+    stats["merged_rows"] += sum(len(cells) for cells in partials)
+    return combine_cells(partials, keys)
+
+
+def _read_tail(csv_path, n_bytes=64 * 1024):
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(len(header), size - n_bytes))
+        tail = f.read()
+    newline = "\r\n" if header.endswith(b"\r\n") else "\n"
+    last_line = tail.rstrip(b"\r\n").rsplit(b"\n", 1)[-1]
+    if last_line.strip() == header.strip():
+        last = None
+    else:
+        last = pd.read_csv(io.BytesIO(header + last_line + b"\n"))
+    return header.decode().strip().split(","), last, newline, tail.endswith(b"\n")
+
+
+def append_records(csv_path, new_df, cube_path):
+    # Append-only: baris baru harus lebih baru dari data yang ada, lalu hanya baris baru yang
+    # diagregasi ke sel cube. Append dicatat di jurnal, jadi cache proses lain (frame loader,
+    # laporan validasi, cube dan prefix-nya) juga cukup melipat baris baru. Penyalinan sel dan
+    # penulisan ulang file cube tetap sebanding jumlah sel.
+    columns, last, newline, ends_with_newline = _read_tail(csv_path)
+    new_df = new_df.copy()
+    if "instant" in columns and "instant" not in new_df.columns:
+        start = int(last["instant"].iloc[0]) + 1 if last is not None else 1
+        new_df.insert(0, "instant", range(start, start + len(new_df)))
+    missing = [col for col in columns if col not in new_df.columns]
+    extra = [col for col in new_df.columns if col not in columns]
+    if missing or extra:
+        raise ValueError(f"columns do not match {csv_path}: missing {missing}, unexpected {extra}")
+    if new_df.empty:
+        raise ValueError("no records to append")
+    new_df = new_df[columns]
+
+    new_rows = prepare_frame(new_df.copy())
+    # Berkas multi-stasiun: urutan dicek per stasiun dan cube_path adalah cube stasiun
+    # (snapshot/<name>_<digest>_station_cube.parquet); import di sini karena stations memakai modul ini
+    from stations import STATION_COL, check_station_order, load_station_cube, merge_station_cells, store_station_cube
+    by_station = STATION_COL in columns
+
+    # Cube lama dimuat sebelum CSV berubah, supaya tidak dibangun ulang dari awal
+    if by_station:
+        station_cube = load_station_cube(csv_path, cube_path)
+        check_station_order(station_cube, new_rows)
+    else:
+        timestamps = new_rows["order_date"]
+        if not timestamps.is_monotonic_increasing or timestamps.duplicated().any():
+            raise ValueError("new records must have strictly increasing timestamps")
+        if last is not None:
+            last_timestamp = prepare_frame(last.copy())["order_date"].iloc[0]
+            if timestamps.iloc[0] <= last_timestamp:
+                raise ValueError(f"new records start at {timestamps.iloc[0]}, not after {last_timestamp}")
+        cube = load_cube(csv_path, cube_path)
+    old_stamp = _source_stamp(csv_path)
+
+    with open(csv_path, "a", newline="") as f:
+        if not ends_with_newline:
+            f.write(newline)
+        new_df.to_csv(f, header=False, index=False, lineterminator=newline)
+
+    stamp = _source_stamp(csv_path)
+    try:
+        record_append(csv_path, old_stamp, stamp)
+        append_snapshot(snapshot_path(csv_path), csv_path, old_stamp)
+    except OSError:
+        # Direktori read-only: proses lain membaca ulang CSV seperti sebelumnya
+        pass
+    if by_station:
+        new_cells = build_cube(new_rows, [STATION_COL])
+        merged = merge_station_cells(station_cube.cells, new_cells)
+        return store_station_cube(cube_path, station_cube.extended(merged, stamp, new_cells["order_date"].min()))
+    new_cells = build_cube(new_rows)
+    return store_cube(cube_path, cube.extended(merge_cells(cube.cells, new_cells), new_cells["order_date"].iloc[0]), stamp)
+
+
+def merge_cells(cells, new_cells):
+    # Hanya ekor cube yang bisa bertumpuk dengan data baru (hari terakhir pada hour.csv)
+    first_new = new_cells["order_date"].iloc[0]
+    split = int(cells["order_date"].searchsorted(first_new, side="left"))
+    if split == len(cells):
+        merged = pd.concat([cells, new_cells], ignore_index=True)
+    else:
+        tail = combine_cells([cells.iloc[split:], new_cells])
+        merged = pd.concat([cells.iloc[:split], tail], ignore_index=True)
+    return merged.astype(cells.dtypes.to_dict())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or incrementally update the on-disk data cube")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="stream a (large) day/hour CSV into the cube in chunks")
+    build.add_argument("csv_path")
+    build.add_argument("cube_path", nargs="?", default=None, help="default: the dashboard's cube for csv_path")
+    build.add_argument("--memory-mb", type=int, default=DEFAULT_MEMORY_MB,
+                       help="approximate memory budget for one parsed chunk")
+
+    append = commands.add_parser("append", help="append new day/hour records and update the cube")
+    append.add_argument("csv_path")
+    append.add_argument("records_path", help="CSV with the new records, same columns as csv_path")
+    append.add_argument("cube_path", nargs="?", default=None,
+                        help="cube to update (default: the dashboard's cube, or its station cube for CSVs "
+                             "with a station column)")
+    args = parser.parse_args()
+    if args.cube_path is None:
+        from stations import STATION_COL
+        by_station = args.command == "append" and STATION_COL in pd.read_csv(args.csv_path, nrows=0).columns
+        args.cube_path = snapshot_path(args.csv_path, "_station_cube.parquet" if by_station else "_cube.parquet")
+
+    if args.command == "build":
+        stat = os.stat(args.csv_path)
+        cells = build_cube_chunked(args.csv_path, args.memory_mb)
+        write_cube(cells, args.cube_path, (stat.st_mtime_ns, stat.st_size))
+    else:
+        try:
+            cells = append_records(args.csv_path, pd.read_csv(args.records_path), args.cube_path).cells
+        except ValueError as e:
+            parser.error(str(e))
+    print(f"{len(cells)} cells, {cells['order_date'].min().date()} .. {cells['order_date'].max().date()} -> {args.cube_path}")
+
+    # Validasi versi data yang baru sekali di sini, supaya dashboard cukup membaca laporannya
+    report = load_report(args.csv_path)
+    print(f"data quality: {report['status']}, {len(report['checks'])} checks in {report['elapsed_s']} s")
+
+
+if __name__ == "__main__":
+    main()
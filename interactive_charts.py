@@ -0,0 +1,138 @@
+import threading
+
+from trends import TREND_LABELS
+
+# Altair (~0,5 s) baru di-import saat chart pertama dibuat
+alt = None
+_import_lock = threading.Lock()
+
+HIGHLIGHT = "#90CAF9"
+MUTED = "#D3D3D3"
+
+BAR_PANELS = [
+    ("casual", "Casual Renter"),
+    ("registered", "Registered Renter"),
+    ("total", "Total Renter"),
+]
+
+
+def load_altair():
+    global alt
+    with _import_lock:
+        if alt is None:
+            import altair
+            alt = altair
+
+
+# Hanya tabel agregat kecil yang dikirim ke browser; Vega-Lite yang menggambar,
+# termasuk hover dan zoom, jadi server tidak perlu merender gambar.
+
+
+def daily_orders_chart(daily_orders_df):
+    chart = alt.Chart(daily_orders_df[["order_date", "total"]]).mark_line(
+        point=True, color=HIGHLIGHT, strokeWidth=2
+    ).encode(
+        x=alt.X("order_date:T", title=None),
+        y=alt.Y("total:Q", title=None),
+        tooltip=[alt.Tooltip("order_date:T", title="Date"), alt.Tooltip("total:Q", title="Total Renter", format=",")],
+    ).properties(title="Total Renter", height=360)
+
+    # Estimasi sampel: pita 95% CI di belakang garis
+    if "total_err" in daily_orders_df.columns:
+        band = daily_orders_df[["order_date", "total", "total_err"]].assign(
+            low=lambda df: df["total"] - df["total_err"], high=lambda df: df["total"] + df["total_err"])
+        chart = alt.Chart(band).mark_area(color=HIGHLIGHT, opacity=0.3).encode(
+            x="order_date:T",
+            y="low:Q",
+            y2="high:Q",
+            tooltip=[alt.Tooltip("order_date:T", title="Date"),
+                     alt.Tooltip("total_err:Q", title="± 95% CI", format=",.0f")],
+        ) + chart
+
+    overlays = [col for col in TREND_LABELS if col in daily_orders_df.columns]
+    if overlays:
+        data = daily_orders_df[["order_date"] + overlays].rename(columns=TREND_LABELS)
+        trend = alt.Chart(data).transform_fold(
+            [TREND_LABELS[col] for col in overlays], as_=["trend", "value"]
+        ).mark_line(strokeDash=[6, 4], strokeWidth=2).encode(
+            x="order_date:T",
+            y="value:Q",
+            color=alt.Color("trend:N", title=None, legend=alt.Legend(orient="top")),
+            tooltip=[alt.Tooltip("order_date:T", title="Date"), alt.Tooltip("trend:N", title="Trend"),
+                     alt.Tooltip("value:Q", format=",.0f")],
+        )
+        chart = chart + trend
+    return chart.interactive(bind_y=False)
+
+
+def hourly_chart(hourly_df):
+    chart = alt.Chart(hourly_df[["order_date", "total"]]).mark_line(
+        color=HIGHLIGHT, strokeWidth=1
+    ).encode(
+        x=alt.X("order_date:T", title=None),
+        y=alt.Y("total:Q", title=None),
+        tooltip=[alt.Tooltip("order_date:T", title="Time", format="%Y-%m-%d %H:00"),
+                 alt.Tooltip("total:Q", title="Total Renter", format=",")],
+    ).properties(title="Total Renter per Hour", height=360)
+    return chart.interactive(bind_y=False)
+
+
+def hour_profile_chart(profile_df):
+    return alt.Chart(profile_df).mark_line(point=True).encode(
+        x=alt.X("hr:O", title="Hour"),
+        y=alt.Y("total:Q", title="Average Renter"),
+        color=alt.Color("weekday:N", title=None, sort=list(profile_df["weekday"].unique())),
+        tooltip=[alt.Tooltip("weekday:N", title="Day"), alt.Tooltip("hr:O", title="Hour"),
+                 alt.Tooltip("total:Q", title="Average Renter", format=",.1f")],
+    ).properties(title="Average Renter by Hour of Day", height=360)
+
+
+def correlation_chart(corr_df):
+    order = list(corr_df.columns)
+    data = corr_df.rename_axis("row").reset_index().melt(id_vars="row", var_name="column", value_name="value")
+    base = alt.Chart(data).encode(
+        x=alt.X("column:N", title=None, sort=order),
+        y=alt.Y("row:N", title=None, sort=order),
+    )
+    cells = base.mark_rect().encode(
+        color=alt.Color("value:Q", title=None, scale=alt.Scale(scheme="blues", domain=[-1, 1])),
+        tooltip=[alt.Tooltip("row:N"), alt.Tooltip("column:N"), alt.Tooltip("value:Q", format=".3f")],
+    )
+    labels = base.mark_text(fontSize=12).encode(text=alt.Text("value:Q", format=".2f"))
+    return (cells + labels).properties(title="Correlation", height=420)
+
+
+def renter_bar_chart(df, y, x, title):
+    data = df[[y, x]].copy()
+    data["highlight"] = data[x] == data[x].max()
+    order = list(data.sort_values(x, ascending=False)[y])
+    chart = alt.Chart(data).mark_bar().encode(
+        x=alt.X(f"{x}:Q", title="Number of Renter", axis=alt.Axis(format=",")),
+        y=alt.Y(f"{y}:N", title=None, sort=order),
+        color=alt.condition(alt.datum.highlight, alt.value(HIGHLIGHT), alt.value(MUTED)),
+        tooltip=[alt.Tooltip(f"{y}:N", title=y), alt.Tooltip(f"{x}:Q", title=title, format=",")],
+    )
+
+    # Estimasi sampel: garis 95% CI di ujung tiap batang
+    if f"{x}_err" in df.columns:
+        err = df[[y, x, f"{x}_err"]].assign(low=lambda d: d[x] - d[f"{x}_err"], high=lambda d: d[x] + d[f"{x}_err"])
+        chart = chart + alt.Chart(err).mark_rule(strokeWidth=2).encode(
+            x="low:Q",
+            x2="high:Q",
+            y=alt.Y(f"{y}:N", sort=order),
+            tooltip=[alt.Tooltip(f"{y}:N", title=y), alt.Tooltip(f"{x}_err:Q", title="± 95% CI", format=",.0f")],
+        )
+    return chart.properties(title=title)
+
+
+def section_charts(section, df):
+    load_altair()
+    if section == "daily":
+        return [daily_orders_chart(df)]
+    if section == "hourly":
+        return [hourly_chart(df)]
+    if section == "hour_profile":
+        return [hour_profile_chart(df)]
+    if section == "correlation":
+        return [correlation_chart(df)]
+    return [renter_bar_chart(df, section, x, title) for x, title in BAR_PANELS]
@@ -0,0 +1,196 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Cache hasil parsing per proses: {path: {"stamp", "digest", "hasher", "df"}}
+_cache = {}
+_lock = threading.Lock()
+
+# Objek turunan per pilihan (subset stasiun, filter) sebesar data mentah; kombinasinya tak
+# terbatas, jadi hanya beberapa yang terakhir dipakai yang disimpan per file
+SELECTION_CACHE_SIZE = 4
+# Jumlah append terakhir yang dicatat di jurnal per file
+APPEND_JOURNAL_SIZE = 64
+
+
+def snapshot_path(path, suffix="", out_dir="snapshot"):
+    # Lokasi berkas turunan (snapshot, cube, laporan) per file data: nama file + digest path
+    # absolut, supaya day.csv, data/day.csv dan dashboard/day.csv tidak saling menimpa
+    stem = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+    return os.path.join(out_dir, f"{stem}_{digest}{suffix}")
+
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _file_hasher(path, chunk_size=1 << 20):
+    # Objek sha1 disimpan bersama cache, supaya append cukup meng-update byte barunya
+    hasher = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher
+
+
+def append_journal_path(path):
+    return snapshot_path(path, "_append.json")
+
+
+def record_append(path, old_stamp, stamp):
+    # Dicatat oleh ingest.py append: versi `stamp` adalah versi `old_stamp` ditambah byte di
+    # belakangnya, jadi proses lain cukup membaca byte mulai old_stamp[1]
+    journal_path = append_journal_path(path)
+    try:
+        with open(journal_path) as f:
+            records = json.load(f)
+    except (OSError, ValueError):
+        records = []
+    records = (records + [{"from": list(old_stamp), "stamp": list(stamp)}])[-APPEND_JOURNAL_SIZE:]
+    os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
+    tmp_path = journal_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(records, f)
+    os.replace(tmp_path, journal_path)
+
+
+def appended_bytes(path, old_stamp, stamp):
+    # (header, byte baru) antara dua versi file yang tersambung lewat jurnal append; None bila
+    # perubahan file bukan append yang tercatat (mis. file ditulis ulang)
+    try:
+        with open(append_journal_path(path)) as f:
+            records = {tuple(record["from"]): tuple(record["stamp"]) for record in json.load(f)}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    current = tuple(old_stamp)
+    while current != tuple(stamp):
+        current = records.get(current)
+        if current is None:
+            return None
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(old_stamp[1])
+        data = f.read(stamp[1] - old_stamp[1])
+    if len(data) != stamp[1] - old_stamp[1]:
+        return None
+    return header, data
+
+
+def read_appended(header, data, **kwargs):
+    # Baris mentah hasil append (seperti pd.read_csv atas file utuh, hanya baris baru)
+    return pd.read_csv(io.BytesIO(header + data), **kwargs)
+
+
+def prepare_frame(df):
+    df["dteday"] = pd.to_datetime(df["dteday"])
+    if "hr" in df.columns:
+        df["dteday"] = df["dteday"] + pd.to_timedelta(df["hr"], unit="h")
+    df = df.rename(columns={"dteday": "order_date"})
+    return df
+
+
+def read_dataset(path):
+    return prepare_frame(pd.read_csv(path))
+
+
+def _entry(path):
+    path = os.path.abspath(path)
+    stamp = _file_stamp(path)
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry["stamp"] == stamp:
+            return entry
+
+        # Versi baru hasil ingest.py append: hanya byte baru yang di-hash dan di-parse
+        if entry is not None:
+            appended = appended_bytes(path, entry["stamp"], stamp)
+            if appended is not None:
+                extended = _extended_entry(entry, stamp, *appended)
+                if extended is not None:
+                    _cache[path] = extended
+                    return extended
+
+        # mtime berubah tapi isi sama (mis. file di-touch) -> pakai frame lama
+        hasher = _file_hasher(path)
+        if entry is not None and entry["digest"] == hasher.hexdigest():
+            entry["stamp"] = stamp
+            return entry
+
+        entry = {"stamp": stamp, "digest": hasher.hexdigest(), "hasher": hasher, "df": read_dataset(path)}
+        _cache[path] = entry
+        return entry
+
+
+def _extended_entry(entry, stamp, header, data):
+    # Entry baru (entry lama tetap dipakai rerun yang sedang berjalan): frame lama + baris baru,
+    # objek turunan yang punya extended(df, split) diperpanjang, sisanya dibangun ulang saat dipakai
+    df = entry["df"]
+    try:
+        new_rows = prepare_frame(read_appended(header, data))
+        if list(new_rows.columns) != list(df.columns):
+            return None
+        new_rows = new_rows.astype(df.dtypes.to_dict())
+    except (ValueError, TypeError):
+        return None
+    hasher = entry["hasher"].copy()
+    hasher.update(data)
+    extended = {"stamp": stamp, "digest": hasher.hexdigest(), "hasher": hasher,
+                "df": pd.concat([df, new_rows], ignore_index=True)}
+    extended["derived"] = {key: value.extended(extended["df"], len(df))
+                           for key, value in entry.get("derived", {}).items() if hasattr(value, "extended")}
+    return extended
+
+
+def load_dataset(path):
+    # Frame yang dikembalikan dibagi antar rerun, jangan diubah in-place
+    return _entry(path)["df"]
+
+
+def load_derived(path, key, build):
+    # Objek turunan (indeks, cube, dsb.) ikut di-cache dan di-invalidate bersama file-nya
+    entry = _entry(path)
+    with _lock:
+        derived = entry.setdefault("derived", {})
+        if key not in derived:
+            derived[key] = build(entry["df"])
+        return derived[key]
+
+
+def load_selection(path, key, build, maxsize=SELECTION_CACHE_SIZE):
+    # Seperti load_derived, tapi LRU terbatas; dibangun di luar lock supaya build boleh
+    # memakai load_derived (mis. indeks bersama milik file yang sama)
+    entry = _entry(path)
+    with _lock:
+        selections = entry.setdefault("selections", OrderedDict())
+        if key in selections:
+            selections.move_to_end(key)
+            return selections[key]
+    value = build(entry["df"])
+    with _lock:
+        selections[key] = value
+        selections.move_to_end(key)
+        while len(selections) > maxsize:
+            selections.popitem(last=False)
+    return value
+
+
+def cached_frames():
+    # Frame yang dibagi semua sesi di proses ini (untuk laporan memori)
+    with _lock:
+        return [entry["df"] for entry in _cache.values()]
+
+
+def dataset_version(path):
+    return _entry(path)["digest"]
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,111 @@
+import os
+import sys
+import threading
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+from numpy.lib.array_utils import byte_bounds
+
+# Sesi yang tidak rerun selama ini dianggap sudah ditutup
+SESSION_TTL = 3600
+
+# {session_id: (byte milik sesi, waktu rerun terakhir)}
+_sessions = {}
+_lock = threading.Lock()
+
+# Ukuran frame bersama dihitung sekali per objek frame (= per versi data): {id: (weakref, bytes, buffers)}
+_shared = {}
+
+
+def process_rss():
+    # RSS saat ini dari /proc (Linux); di OS lain pakai puncak RSS dari getrusage
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True, index=False).sum())
+
+
+def column_buffers(series):
+    # Rentang alamat (awal, akhir) buffer kolom lewat API publik, tanpa menyalin data: buffer Arrow
+    # untuk kolom str/Arrow (to_numpy() di pandas 3 menyalin), ndarray untuk kolom numpy/datetime
+    # dan kode kategori. None bila tidak bisa dipastikan tanpa salinan (tipe ekstensi lain).
+    dtype = series.dtype
+    if isinstance(dtype, pd.ArrowDtype) or (isinstance(dtype, pd.StringDtype) and dtype.storage == "pyarrow"):
+        arrow = series.array.__arrow_array__()
+        return [(buf.address, buf.address + buf.size) for chunk in getattr(arrow, "chunks", [arrow])
+                for buf in chunk.buffers() if buf is not None and buf.size]
+    if isinstance(dtype, pd.CategoricalDtype):
+        values = series.array.codes
+    elif isinstance(dtype, np.dtype):
+        values = series.to_numpy(copy=False)
+    else:
+        return None
+    if values.size == 0:
+        return []
+    return [byte_bounds(values)]
+
+
+def shared_info(df):
+    # (byte, rentang buffer) frame bersama, di-cache selama objek frame masih hidup
+    with _lock:
+        entry = _shared.get(id(df))
+        if entry is not None and entry[0]() is df:
+            return entry[1], entry[2]
+    nbytes = frame_bytes(df)
+    buffers = [bounds for col in df.columns for bounds in column_buffers(df[col]) or []]
+    with _lock:
+        for key in [key for key, (ref, _, _) in _shared.items() if ref() is None]:
+            del _shared[key]
+        _shared[id(df)] = (weakref.ref(df), nbytes, buffers)
+    return nbytes, buffers
+
+
+def owned_bytes(df, shared_frames):
+    # Byte kolom yang tidak berbagi buffer dengan dataset bersama: slice zero-copy dihitung 0
+    shared = [bounds for df_shared in shared_frames for bounds in shared_info(df_shared)[1]]
+    usage = df.memory_usage(deep=True, index=False)
+    total = 0
+    for col in df.columns:
+        buffers = column_buffers(df[col])
+        # Buffer tak diketahui: dianggap bersama, bukan dihitung milik sesi
+        if buffers is None:
+            continue
+        if not any(lo < shared_hi and shared_lo < hi for lo, hi in buffers for shared_lo, shared_hi in shared):
+            total += int(usage[col])
+    return total
+
+
+def record_session(session_id, nbytes):
+    # Mengembalikan jumlah sesi aktif dan total byte milik sesi di proses ini
+    now = time.time()
+    with _lock:
+        _sessions[session_id] = (nbytes, now)
+        for key in [key for key, (_, seen) in _sessions.items() if now - seen > SESSION_TTL]:
+            del _sessions[key]
+        return len(_sessions), sum(n for n, _ in _sessions.values())
+
+
+def memory_report(session_id, session_frames, shared_frames):
+    session = sum(owned_bytes(df, shared_frames) for df in session_frames)
+    sessions, sessions_total = record_session(session_id, session)
+    return {
+        "session_bytes": session,
+        "shared_bytes": sum(shared_info(df)[0] for df in shared_frames),
+        "sessions": sessions,
+        "sessions_bytes": sessions_total,
+        "process_rss": process_rss(),
+    }
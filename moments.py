@@ -0,0 +1,113 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from aggregate import MEASURES
+from timeindex import extend_prefix
+
+WEATHER_COLUMNS = ["temp", "atemp", "hum", "windspeed"]
+MOMENT_COLUMNS = WEATHER_COLUMNS + MEASURES
+
+# Statistik cukup per sel cube, dijumlahkan bersama ukuran setiap kali sel digabung: jumlah nilai
+# cuaca (jumlah casual/registered/cnt sudah ada di sel) dan cross-product segitiga atas
+SUM_COLUMNS = [f"sum_{col}" for col in WEATHER_COLUMNS]
+_UPPER = np.triu_indices(len(MOMENT_COLUMNS))
+CROSS_COLUMNS = [f"xx_{MOMENT_COLUMNS[i]}_{MOMENT_COLUMNS[j]}" for i, j in zip(*_UPPER)]
+MOMENT_CELL_COLUMNS = SUM_COLUMNS + CROSS_COLUMNS
+
+
+def has_moments(df):
+    return set(MOMENT_COLUMNS) <= set(df.columns)
+
+
+def moment_sums(df, group_codes, n_groups):
+    # Jumlah per grup (kode 0..n_groups-1) satu kolom produk sekaligus, tanpa matriks n x 28
+    values = df[MOMENT_COLUMNS].to_numpy(dtype=np.float64)
+    sums = {}
+    for i, name in enumerate(SUM_COLUMNS):
+        sums[name] = np.bincount(group_codes, weights=values[:, i], minlength=n_groups)
+    for name, i, j in zip(CROSS_COLUMNS, *_UPPER):
+        sums[name] = np.bincount(group_codes, weights=values[:, i] * values[:, j], minlength=n_groups)
+    return sums
+
+
+def daily_moments(cells):
+    # (hari, n, jumlah (hari x k), cross-product segitiga atas (hari x k(k+1)/2)) dari sel cube
+    if not cells["order_date"].is_monotonic_increasing:
+        cells = cells.sort_values("order_date", kind="stable")
+    dates = cells["order_date"].to_numpy().astype("datetime64[D]")
+    if len(dates) == 0:
+        return dates, np.zeros(0), np.zeros((0, len(MOMENT_COLUMNS))), np.zeros((0, len(CROSS_COLUMNS)))
+    starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+    n = np.add.reduceat(cells["count"].to_numpy(dtype=np.float64), starts)
+    sums = np.add.reduceat(cells[SUM_COLUMNS + MEASURES].to_numpy(dtype=np.float64), starts, axis=0)
+    cross = np.add.reduceat(cells[CROSS_COLUMNS].to_numpy(dtype=np.float64), starts, axis=0)
+    return dates[starts], n, sums, cross
+
+
+class RangeMoments:
+    # Prefix array atas hari: jumlah baris (d+1), jumlah (d+1, k) dan cross-product segitiga atas
+    # (d+1, k(k+1)/2), dilipat dari sel cube. Dibangun O(hari x k^2) tanpa membaca CSV mentah;
+    # matriks kovarians/korelasi rentang mana pun cukup O(k^2).
+
+    def __init__(self, cells):
+        self.columns = list(MOMENT_COLUMNS)
+        dates, n, sums, cross = daily_moments(cells)
+        # Digeser ke rata-rata global agar selisih prefix tidak kehilangan presisi
+        self.shift = sums.sum(axis=0) / n.sum() if n.sum() else np.zeros(len(self.columns))
+        sums, cross = self._shifted(n, sums, cross)
+
+        self.dates = dates
+        self.counts = extend_prefix(np.zeros(1), 0, n)
+        self.sums = extend_prefix(np.zeros((1, len(self.columns))), 0, sums)
+        self.cross = extend_prefix(np.zeros((1, len(CROSS_COLUMNS))), 0, cross)
+
+    def extended(self, cells, split):
+        # Momen versi cube setelah append (sel [0, split) tidak berubah): hari sejak sel pertama
+        # yang berubah dilipat ulang di sekitar shift yang sama, prefix lama dipakai ulang
+        dates, n, sums, cross = daily_moments(cells.iloc[split:])
+        if not len(dates):
+            return self
+        keep = int(np.searchsorted(self.dates, dates[0], side="left"))
+        sums, cross = self._shifted(n, sums, cross)
+        moments = copy.copy(self)
+        moments.dates = np.concatenate([self.dates[:keep], dates])
+        moments.counts = extend_prefix(self.counts, keep, n)
+        moments.sums = extend_prefix(self.sums, keep, sums)
+        moments.cross = extend_prefix(self.cross, keep, cross)
+        return moments
+
+    def _shifted(self, n, sums, cross):
+        # Momen di sekitar self.shift: sum(x - m) dan sum((x_i - m_i)(x_j - m_j)) per hari
+        i, j = _UPPER
+        shift = self.shift
+        cross = cross - sums[:, i] * shift[j] - shift[i] * sums[:, j] + n[:, None] * (shift[i] * shift[j])
+        return sums - n[:, None] * shift, cross
+
+    def _range_moments(self, start_date, end_date):
+        lo = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start_date).date()), side="left"))
+        hi = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end_date).date()), side="right"))
+        hi = max(lo, hi)
+        n = self.counts[hi] - self.counts[lo]
+        sums = self.sums[hi] - self.sums[lo]
+        cross = np.zeros((len(self.columns),) * 2)
+        cross[_UPPER] = self.cross[hi] - self.cross[lo]
+        cross.T[_UPPER] = cross[_UPPER]
+        return n, sums, cross
+
+    def cov(self, start_date, end_date):
+        n, sums, cross = self._range_moments(start_date, end_date)
+        if n < 2:
+            values = np.full((len(self.columns),) * 2, np.nan)
+        else:
+            values = (cross - np.outer(sums, sums) / n) / (n - 1)
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def corr(self, start_date, end_date):
+        cov = self.cov(start_date, end_date).to_numpy()
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = cov / np.outer(std, std)
+        np.fill_diagonal(values, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
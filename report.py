@@ -0,0 +1,108 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+import charts
+from charts import SAVEFIG_OPTIONS, plot_section
+from cube import load_cube
+from loader import snapshot_path
+
+REPORT_SECTIONS = ["daily", "weekday", "season", "mnth", "yr"]
+FREQUENCIES = {"week": "W-MON", "month": "MS"}
+
+
+def cube_path_for(csv_path, cube_dir):
+    # Sama dengan lokasi cube dashboard: day.csv -> snapshot/day_<digest path>_cube.parquet
+    return snapshot_path(csv_path, "_cube.parquet", cube_dir)
+
+
+def report_ranges(min_date, max_date, freq):
+    # Rentang laporan per minggu (Senin-Minggu) atau per bulan, dipotong ke batas data
+    min_date = pd.Timestamp(min_date).normalize()
+    max_date = pd.Timestamp(max_date).normalize()
+    starts = pd.date_range(min_date, max_date, freq=FREQUENCIES[freq])
+    if len(starts) == 0 or starts[0] > min_date:
+        starts = starts.insert(0, min_date)
+    ranges = []
+    for start, next_start in zip(starts, list(starts[1:]) + [max_date + pd.Timedelta(days=1)]):
+        ranges.append((start.date(), min(max_date, next_start - pd.Timedelta(days=1)).date()))
+    return ranges
+
+
+def render_range(csv_path, cube_path, start_date, end_date, out_dir, formats):
+    # Dijalankan di worker: cube dibaca sekali per proses (cache modul), lalu lima gambar per rentang
+    cube = load_cube(csv_path, cube_path)
+    aggregates = cube.aggregates(start_date, end_date)
+    if aggregates["daily"].empty:
+        return []
+
+    name = f"{start_date:%Y-%m-%d}_{end_date:%Y-%m-%d}"
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    pdf = None
+    if "pdf" in formats:
+        from matplotlib.backends.backend_pdf import PdfPages
+        paths.append(os.path.join(out_dir, f"{name}.pdf"))
+        pdf = PdfPages(paths[-1])
+    try:
+        for section in REPORT_SECTIONS:
+            fig = plot_section(section, aggregates[section])
+            if "png" in formats:
+                paths.append(os.path.join(out_dir, f"{name}_{section}.png"))
+                fig.savefig(paths[-1], **SAVEFIG_OPTIONS)
+            if pdf is not None:
+                pdf.savefig(fig, bbox_inches="tight")
+            charts.plt.close(fig)
+    finally:
+        if pdf is not None:
+            pdf.close()
+    return paths
+
+
+def render_reports(sources, out_dir, freq="month", formats=("png", "pdf"), cube_dir="snapshot",
+                   start_date=None, end_date=None, workers=None):
+    # Satu job per (sumber/stasiun, rentang); job dibagi ke process pool sebanyak core
+    jobs = []
+    for csv_path in sources:
+        cube_path = cube_path_for(csv_path, cube_dir)
+        # Cube dibangun di proses utama dulu, supaya worker cukup membaca Parquet
+        cube = load_cube(csv_path, cube_path)
+        station = os.path.splitext(os.path.basename(csv_path))[0]
+        first = max(cube.min_date, pd.Timestamp(start_date)) if start_date else cube.min_date
+        last = min(cube.max_date, pd.Timestamp(end_date)) if end_date else cube.max_date
+        for start, end in report_ranges(first, last, freq):
+            jobs.append((csv_path, cube_path, start, end, os.path.join(out_dir, station, freq), formats))
+
+    paths = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(render_range, *job) for job in jobs]
+        for future in as_completed(futures):
+            paths += future.result()
+    return len(jobs), paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render PNG/PDF reports of the dashboard sections without Streamlit")
+    parser.add_argument("sources", nargs="*", default=["day.csv"], help="day/hour CSVs, one per station")
+    parser.add_argument("--out-dir", default="reports")
+    parser.add_argument("--freq", choices=sorted(FREQUENCIES), default="month")
+    parser.add_argument("--format", dest="formats", nargs="+", choices=["png", "pdf"], default=["png", "pdf"])
+    parser.add_argument("--cube-dir", default="snapshot")
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: number of cores)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    n_ranges, paths = render_reports(args.sources, args.out_dir, args.freq, args.formats, args.cube_dir,
+                                     args.start, args.end, args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"{n_ranges} ranges, {len(paths)} files -> {args.out_dir} in {elapsed:.1f} s "
+          f"({n_ranges / elapsed:.2f} ranges/s, {args.workers or os.cpu_count()} workers)")
+
+
+if __name__ == "__main__":
+    main()
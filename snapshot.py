@@ -0,0 +1,167 @@
+import argparse
+import functools
+import json
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from aggregate import base_year
+from loader import appended_bytes, prepare_frame, read_appended, read_dataset, snapshot_path
+
+COMPACT_DTYPES = {
+    "instant": "int32",
+    "season": "int8",
+    "yr": "int16",
+    "mnth": "int8",
+    "hr": "int8",
+    "holiday": "int8",
+    "weekday": "int8",
+    "workingday": "int8",
+    "weathersit": "int8",
+    "temp": "float32",
+    "atemp": "float32",
+    "hum": "float32",
+    "windspeed": "float32",
+    "casual": "int32",
+    "registered": "int32",
+    "cnt": "int32",
+}
+
+PARTITION_COLS = ["yr", "mnth"]
+META_FILE = "_meta.json"
+
+_partitioning = ds.partitioning(
+    pa.schema([("yr", pa.int16()), ("mnth", pa.int8())]), flavor="hive"
+)
+
+
+def compact_frame(df):
+    dtypes = {col: dtype for col, dtype in COMPACT_DTYPES.items() if col in df.columns}
+    return df.astype(dtypes)
+
+
+def write_snapshot(csv_path, out_dir):
+    df = compact_frame(read_dataset(csv_path))
+    stat = os.stat(csv_path)
+    meta = {
+        "source": os.path.abspath(csv_path),
+        "source_stamp": [stat.st_mtime_ns, stat.st_size],
+        "rows": len(df),
+        "columns": list(df.columns),
+        "min_date": df["order_date"].min().isoformat(),
+        "max_date": df["order_date"].max().isoformat(),
+        "base_year": base_year(df),
+    }
+
+    # Tulis ke direktori sementara dulu supaya pembaca tidak melihat snapshot setengah jadi
+    tmp_dir = out_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_to_dataset(table, tmp_dir, partition_cols=PARTITION_COLS)
+    with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return meta
+
+
+def append_snapshot(snapshot_dir, csv_path, old_stamp):
+    # Baris hasil ingest.py append ditulis sebagai file Parquet baru di partisi bulannya;
+    # file lama tidak disentuh, hanya _meta.json yang diganti. False bila snapshot bukan
+    # versi old_stamp (pembaca lalu kembali ke CSV sampai snapshot dibuat ulang)
+    try:
+        meta = read_snapshot_meta(snapshot_dir)
+    except FileNotFoundError:
+        return False
+    stat = os.stat(csv_path)
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    appended = appended_bytes(csv_path, old_stamp, stamp) if meta["source_stamp"] == list(old_stamp) else None
+    if appended is None:
+        return False
+    df = compact_frame(prepare_frame(read_appended(*appended)))
+    if list(df.columns) != meta["columns"]:
+        return False
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_to_dataset(table, snapshot_dir, partition_cols=PARTITION_COLS,
+                        basename_template=f"append-{stat.st_size}-{{i}}.parquet")
+    meta.update(source_stamp=stamp, rows=meta["rows"] + len(df),
+                max_date=max(pd.Timestamp(meta["max_date"]), df["order_date"].max()).isoformat())
+    # Berawalan _ seperti META_FILE, jadi tidak dianggap bagian dataset
+    tmp_path = os.path.join(snapshot_dir, META_FILE + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, os.path.join(snapshot_dir, META_FILE))
+    return True
+
+
+def read_snapshot_meta(snapshot_dir):
+    with open(os.path.join(snapshot_dir, META_FILE)) as f:
+        return json.load(f)
+
+
+def snapshot_is_current(snapshot_dir, csv_path):
+    try:
+        meta = read_snapshot_meta(snapshot_dir)
+        stat = os.stat(csv_path)
+    except FileNotFoundError:
+        return False
+    return meta["source"] == os.path.abspath(csv_path) and meta["source_stamp"] == [stat.st_mtime_ns, stat.st_size]
+
+
+def _partition_filter(start, end, base_year):
+    months = pd.period_range(start, end, freq="M")
+    expr = None
+    for month in months:
+        part = (ds.field("yr") == month.year - base_year) & (ds.field("mnth") == month.month)
+        expr = part if expr is None else expr | part
+    return expr
+
+
+def read_snapshot(snapshot_dir, start_date=None, end_date=None, columns=None):
+    meta = read_snapshot_meta(snapshot_dir)
+    start = pd.Timestamp(start_date or meta["min_date"]).normalize()
+    end = pd.Timestamp(end_date or meta["max_date"]).normalize()
+    if columns is not None:
+        columns = tuple(columns)
+    return _read_range(snapshot_dir, tuple(meta["source_stamp"]), start, end, columns)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_range(snapshot_dir, stamp, start, end, columns):
+    meta = read_snapshot_meta(snapshot_dir)
+    dataset = ds.dataset(snapshot_dir, format="parquet", partitioning=_partitioning,
+                         exclude_invalid_files=True)
+    # Filter partisi (yr/mnth) memangkas file yang dibaca, filter tanggal memangkas baris
+    expr = _partition_filter(start, end, meta["base_year"])
+    expr = expr & (ds.field("order_date") >= start) & (ds.field("order_date") < end + pd.Timedelta(days=1))
+
+    if columns is not None:
+        columns = ["order_date"] + [col for col in columns if col != "order_date"]
+    table = dataset.to_table(columns=columns, filter=expr)
+    df = table.to_pandas()
+    df = df.sort_values("order_date", kind="stable").reset_index(drop=True)
+    return compact_frame(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert day.csv / hour.csv into a partitioned Parquet snapshot")
+    parser.add_argument("csv_path")
+    parser.add_argument("out_dir", nargs="?", default=None, help="default: the dashboard's snapshot for csv_path")
+    args = parser.parse_args()
+    args.out_dir = args.out_dir or snapshot_path(args.csv_path)
+
+    raw_bytes = read_dataset(args.csv_path).memory_usage(deep=True).sum()
+    meta = write_snapshot(args.csv_path, args.out_dir)
+    compact_bytes = read_snapshot(args.out_dir).memory_usage(deep=True).sum()
+    print(f"{meta['rows']} rows, {meta['min_date']} .. {meta['max_date']} -> {args.out_dir}")
+    print(f"in-memory size: {raw_bytes:,} bytes (read_csv) -> {compact_bytes:,} bytes (snapshot)")
+
+
+if __name__ == "__main__":
+    main()
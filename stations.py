@@ -0,0 +1,258 @@
+import argparse
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from cube import Cube, _source_stamp, _stored_stamp, build_cube, write_cube
+from ingest import CUBE_KEYS, appended_rows, build_cube_chunked, combine_cells
+from loader import snapshot_path
+
+STATION_COL = "station"
+# Di bawah jumlah sel ini penggabungan di proses sendiri lebih cepat daripada lewat pool
+POOL_MIN_CELLS = 200_000
+SUBSET_CACHE_SIZE = 32
+# Row group kecil supaya filter station di worker hanya membaca row group stasiunnya
+# (sel terurut per stasiun, statistik min/max tiap row group memangkas sisanya)
+STATION_ROW_GROUP_ROWS = 32_768
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def _rollup_group(path, stamp, stations):
+    # Dijalankan di worker: hanya row group milik stasiun grup ini yang dibaca dan digabung
+    table = pq.read_table(path, filters=[(STATION_COL, "in", list(stations))])
+    stored = (table.schema.metadata or {}).get(b"source_stamp", b"").decode()
+    if stored != ",".join(str(v) for v in stamp):
+        raise RuntimeError(f"{path} changed while rolling up stations")
+    return combine_cells([table.to_pandas()])
+
+
+class StationCube:
+    # Sel cube per stasiun (partisi), terurut per stasiun. Subset stasiun mana pun digabung
+    # menjadi Cube biasa, jadi semua yang ditampilkan dashboard tetap bisa dihitung.
+
+    def __init__(self, cells, path=None, stamp=None, workers=None):
+        self.cells = cells
+        self.path = path
+        self.stamp = stamp
+        self.workers = workers or os.cpu_count() or 1
+        station = cells[STATION_COL].to_numpy()
+        self.stations = list(pd.unique(station))
+        lo = np.searchsorted(station, self.stations, side="left")
+        hi = np.searchsorted(station, self.stations, side="right")
+        self._bounds = {name: (int(a), int(b)) for name, a, b in zip(self.stations, lo, hi)}
+        dates = cells["order_date"]
+        self.min_date = dates.min()
+        self.max_date = dates.max()
+        self._subsets = OrderedDict()
+        self._subset_lock = threading.Lock()
+        self._full = None
+        self._full_lock = threading.Lock()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    @functools.cached_property
+    def station_totals(self):
+        # Total cnt per stasiun (dasar stratifikasi sampel), satu reduceat atas sel
+        lo = [self._bounds[station][0] for station in self.stations]
+        return pd.Series(np.add.reduceat(self.cells["cnt"].to_numpy(), lo), index=self.stations)
+
+    def partition(self, station):
+        lo, hi = self._bounds[station]
+        return self.cells.iloc[lo:hi]
+
+    def rollup(self, stations):
+        # Rollup parsial tiap partisi digabung per (hari, kategori); kolom station hilang
+        return combine_cells([self.partition(station) for station in stations])
+
+    def _key(self, stations):
+        return tuple(sorted(set(stations or self.stations)))
+
+    def subset_cells(self, stations=None):
+        return sum(hi - lo for lo, hi in (self._bounds[station] for station in self._key(stations)))
+
+    def is_cached(self, stations=None):
+        key = self._key(stations)
+        if len(key) == len(self.stations):
+            return self._full is not None
+        return key in self._subsets
+
+    def full(self):
+        # Rollup semua stasiun disematkan di luar LRU: dipakai tiap rerun (warmer, pilihan kosong),
+        # jadi tidak boleh tergeser subset lain lalu dibangun ulang sebagai Cube baru
+        with self._full_lock:
+            if self._full is None:
+                self._full = self._build_subset(self._key(None))
+            return self._full
+
+    def subset(self, stations=None):
+        # LRU per subset stasiun; subset berisi semua stasiun = full()
+        key = self._key(stations)
+        if len(key) == len(self.stations):
+            return self.full()
+        with self._subset_lock:
+            cube = self._subsets.get(key)
+            if cube is not None:
+                self._subsets.move_to_end(key)
+                return cube
+        cube = self._build_subset(key)
+        with self._subset_lock:
+            self._subsets[key] = cube
+            while len(self._subsets) > SUBSET_CACHE_SIZE:
+                self._subsets.popitem(last=False)
+        return cube
+
+    def _build_subset(self, stations):
+        n_cells = self.subset_cells(stations)
+        if self.path is None or self.workers == 1 or n_cells < POOL_MIN_CELLS:
+            return Cube(self.rollup(stations))
+
+        # Stasiun dibagi rata ke sebanyak core; tiap worker menggabung partisinya sendiri,
+        # sehingga latensi mengikuti jumlah core, bukan jumlah stasiun
+        groups = [list(group) for group in np.array_split(np.array(stations, dtype=object), self.workers) if len(group)]
+        try:
+            partials = list(self.pool().map(_rollup_group, [self.path] * len(groups), [self.stamp] * len(groups), groups))
+        except RuntimeError:
+            # File sel belum/tidak lagi versi ini (append sedang menulisnya): gabung di proses sendiri
+            return Cube(self.rollup(stations))
+        return Cube(combine_cells(partials))
+
+    def extended(self, cells, stamp, since):
+        # StationCube versi setelah append (sel baru/berubah mulai hari `since`). Rollup semua
+        # stasiun yang sudah dibangun diperpanjang dari sel sejak hari itu, bukan digabung ulang;
+        # LRU subset dimulai kosong.
+        station_cube = StationCube(cells, self.path, stamp, self.workers)
+        with self._full_lock:
+            full = self._full
+        if full is not None:
+            split = int(full.cells["order_date"].searchsorted(since, side="left"))
+            tail = combine_cells([cells[(cells["order_date"] >= since).to_numpy()]])
+            full_cells = pd.concat([full.cells.iloc[:split], tail], ignore_index=True)
+            station_cube._full = full.extended(full_cells.astype(full.cells.dtypes.to_dict()), since)
+        return station_cube
+
+    def pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: aman dipakai dari proses Streamlit yang multi-thread
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+def load_station_cube(csv_path, cube_path):
+    # None bila CSV tidak punya kolom station (satu seri global seperti day.csv)
+    stamp = _source_stamp(csv_path)
+    with _lock:
+        entry = _cache.get(cube_path)
+        if entry is not None and entry["stamp"] == stamp:
+            return entry["cube"]
+
+        # CSV hanya bertambah lewat ingest.py append: baris baru dilipat ke sel di memori
+        if entry is not None and entry["cube"] is not None:
+            new_rows = appended_rows(csv_path, entry["stamp"], stamp, [STATION_COL])
+            if new_rows is not None and len(new_rows):
+                new_cells = build_cube(new_rows, [STATION_COL])
+                merged = merge_station_cells(entry["cube"].cells, new_cells)
+                station_cube = entry["cube"].extended(merged, stamp, new_cells["order_date"].min())
+                entry["cube"].close()
+                _cache[cube_path] = {"stamp": stamp, "cube": station_cube}
+                return station_cube
+
+        station_cube = None
+        cells_path = cube_path
+        if STATION_COL in pd.read_csv(csv_path, nrows=0).columns:
+            if _stored_stamp(cube_path) == stamp:
+                cells = pq.read_table(cube_path).to_pandas()
+            else:
+                cells = build_cube_chunked(csv_path, partition_cols=[STATION_COL])
+                try:
+                    write_cube(cells, cube_path, stamp, STATION_ROW_GROUP_ROWS)
+                except OSError:
+                    # Tanpa file sel, worker tidak bisa membaca partisi: gabung di proses sendiri
+                    cells_path = None
+            station_cube = StationCube(cells, cells_path, stamp)
+
+        if entry is not None and entry["cube"] is not None:
+            entry["cube"].close()
+        _cache[cube_path] = {"stamp": stamp, "cube": station_cube}
+        return station_cube
+
+
+def store_station_cube(cube_path, station_cube):
+    # Dipakai append: tulis sel stasiun baru dan ganti entry cache di proses ini
+    write_cube(station_cube.cells, cube_path, station_cube.stamp, STATION_ROW_GROUP_ROWS)
+    station_cube.path = cube_path
+    with _lock:
+        entry = _cache.get(cube_path)
+        if entry is not None and entry["cube"] is not None:
+            entry["cube"].close()
+        _cache[cube_path] = {"stamp": station_cube.stamp, "cube": station_cube}
+    return station_cube
+
+
+def check_station_order(station_cube, new_rows):
+    # Urutan waktu dicek per stasiun (baris stasiun lain boleh berselang-seling): baris baru
+    # tiap stasiun harus naik, dan tidak sebelum hari terakhir stasiun itu di cube
+    # (day.csv: sesudahnya; hour.csv: hari terakhir boleh dilanjutkan jam berikutnya)
+    daily = "hr" not in new_rows.columns
+    for station, rows in new_rows.groupby(STATION_COL, sort=False):
+        timestamps = rows["order_date"]
+        if not timestamps.is_monotonic_increasing or timestamps.duplicated().any():
+            raise ValueError(f"new records for station {station} must have strictly increasing timestamps")
+        if station not in station_cube._bounds:
+            continue
+        last_day = station_cube.partition(station)["order_date"].iloc[-1]
+        first_day = timestamps.iloc[0].normalize()
+        if first_day < last_day or (daily and first_day == last_day):
+            raise ValueError(f"new records for station {station} start at {timestamps.iloc[0]}, "
+                             f"not after {last_day.date()}")
+
+
+def merge_station_cells(cells, new_cells):
+    # Hari terakhir tiap stasiun bisa bertumpuk dengan data baru (hour.csv), jadi sel
+    # digabung per (station, hari, kategori) dan tetap terurut per stasiun
+    return combine_cells([cells, new_cells], [STATION_COL] + CUBE_KEYS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build per-station cube cells and time a rollup over a station subset")
+    parser.add_argument("csv_path")
+    parser.add_argument("cube_path", nargs="?", default=None, help="default: the dashboard's station cube for csv_path")
+    parser.add_argument("--stations", nargs="*", default=None, help="subset to roll up (default: all)")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    args.cube_path = args.cube_path or snapshot_path(args.csv_path, "_station_cube.parquet")
+    station_cube = load_station_cube(args.csv_path, args.cube_path)
+    if station_cube is None:
+        parser.error(f"{args.csv_path} has no {STATION_COL} column")
+    if args.workers:
+        station_cube.workers = args.workers
+
+    started = time.perf_counter()
+    cube = station_cube.subset(args.stations)
+    elapsed = time.perf_counter() - started
+    totals = cube.totals(cube.min_date, cube.max_date)
+    print(f"{len(station_cube.stations)} stations, {len(station_cube.cells):,} cells -> {args.cube_path}")
+    print(f"rollup of {len(args.stations or station_cube.stations)} stations with {station_cube.workers} workers: "
+          f"{len(cube.cells):,} cells in {elapsed * 1000:.1f} ms, totals {totals}")
+    station_cube.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+
+import pandas as pd
+import pytest
+
+from aggregate import DIMENSIONS, create_aggregates, year_labels
+from cube import build_cube, Cube
+from loader import read_dataset
+from synthetic import write_synthetic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MEASURE_AGG = {"casual": "sum", "registered": "sum", "cnt": "sum"}
+
+
+# Implementasi lama (create_*_df di dashboard.py sebelum mesin agregasi) sebagai acuan
+def old_daily_orders_df(df):
+    daily_orders_df = df.resample(rule="D", on="order_date").agg(MEASURE_AGG).reset_index()
+    return daily_orders_df.rename(columns={"cnt": "total"})
+
+
+def old_dimension_df(df, dim, labels):
+    resampled = df.select_dtypes("number").assign(order_date=df["order_date"]).resample(rule="D", on="order_date").sum()
+    dim_df = resampled.groupby(dim).agg(MEASURE_AGG).round(0).reset_index()
+    dim_df = dim_df.rename(columns={"cnt": "total"})
+    dim_df[dim] = dim_df[dim].replace(labels).astype(str)
+    return dim_df
+
+
+def assert_same_as_old(df, aggregates):
+    pd.testing.assert_frame_equal(aggregates["daily"].reset_index(drop=True), old_daily_orders_df(df), check_dtype=False)
+    for dim, labels in DIMENSIONS.items():
+        # Acuan lama hanya kenal label 2011/2012; tahun berikutnya diberi label dari base year
+        labels = year_labels(df) if dim == "yr" else labels
+        pd.testing.assert_frame_equal(aggregates[dim].reset_index(drop=True), old_dimension_df(df, dim, labels),
+                                      check_dtype=False)
+
+
+@pytest.fixture(scope="module")
+def day_df():
+    return read_dataset(os.path.join(ROOT, "day.csv"))
+
+
+@pytest.fixture(scope="module")
+def multi_year_df(tmp_path_factory):
+    path = tmp_path_factory.mktemp("synthetic") / "day_4y.csv"
+    write_synthetic("day", str(path), 2, stations=1, years=4)
+    return read_dataset(str(path))
+
+
+def test_full_range_matches_old(day_df):
+    assert_same_as_old(day_df, create_aggregates(day_df))
+
+
+def test_sub_range_matches_old(day_df):
+    df = day_df[(day_df["order_date"] >= "2011-03-15") & (day_df["order_date"] <= "2012-02-10")]
+    assert_same_as_old(df, create_aggregates(df))
+
+
+def test_multi_year_matches_old(multi_year_df):
+    aggregates = create_aggregates(multi_year_df)
+    assert list(aggregates["yr"]["yr"]) == ["2011", "2012", "2013", "2014"]
+    assert_same_as_old(multi_year_df, aggregates)
+
+
+def test_multi_year_cube_aggregates(multi_year_df):
+    cube = Cube(build_cube(multi_year_df))
+    aggregates = cube.aggregates(cube.min_date, cube.max_date)
+    assert_same_as_old(multi_year_df, aggregates)
+    assert cube.category_labels("yr") == {0: "2011", 1: "2012", 2: "2013", 3: "2014"}
+    # Rentang yang hanya berisi tahun ketiga tetap berlabel tahunnya
+    assert list(cube.aggregates("2013-03-01", "2013-05-31")["yr"]["yr"]) == ["2013"]
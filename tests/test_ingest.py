@@ -0,0 +1,113 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+import cube as cube_module
+import loader
+import validate
+from aggregate import MEASURES
+from bitmap import BitmapIndex
+from cube import Cube, _source_stamp, build_cube, load_cube
+from ingest import append_records, build_cube_chunked, merge_cells
+from loader import dataset_version, load_dataset, load_derived, read_dataset, snapshot_path
+from moments import RangeMoments
+from snapshot import compact_frame, read_snapshot, snapshot_is_current, write_snapshot
+from synthetic import write_synthetic
+from timeindex import TimeIndex
+from trends import Trends
+from validate import load_report, validate_csv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_chunked_cube_matches_full_load():
+    path = os.path.join(ROOT, "data", "hour.csv")
+    cells = build_cube_chunked(path, memory_mb=1)
+    pd.testing.assert_frame_equal(cells, build_cube(read_dataset(path)))
+
+
+def test_chunked_station_cube_merges_geometrically(tmp_path):
+    # Cube 60 stasiun jauh lebih besar dari satu chunk: sel tidak boleh di-group ulang per chunk
+    path = str(tmp_path / "stations.csv")
+    write_synthetic("day", path, 60, stations=60)
+    stats = {}
+    cells = build_cube_chunked(path, memory_mb=1, partition_cols=["station"], stats=stats)
+    pd.testing.assert_frame_equal(cells, build_cube(read_dataset(path), ["station"]))
+    assert stats["chunks"] > 8
+    assert stats["merged_rows"] <= 3 * len(cells)
+
+
+def _split_csv(source, path, n_rows):
+    # n_rows baris pertama source (teks asli) ke path, sisanya dikembalikan sebagai rekaman baru
+    with open(source) as f:
+        lines = f.readlines()
+    with open(path, "w") as f:
+        f.writelines(lines[:n_rows + 1])
+    return pd.read_csv(source).iloc[n_rows:]
+
+
+def test_merge_cells_combines_the_overlapping_day():
+    df = read_dataset(os.path.join(ROOT, "data", "hour.csv")).iloc[:200]
+    # Baris 100 ada di tengah hari: sel hari itu harus digabung, bukan diduplikasi
+    merged = merge_cells(build_cube(df.iloc[:100]), build_cube(df.iloc[100:]))
+    pd.testing.assert_frame_equal(merged, build_cube(df))
+    later = merge_cells(build_cube(df.iloc[:24]), build_cube(df.iloc[24:]))
+    pd.testing.assert_frame_equal(later, build_cube(df))
+
+
+def test_append_extends_caches_instead_of_rebuilding(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = "hour.csv"
+    new_records = _split_csv(os.path.join(ROOT, "data", "hour.csv"), path, 5000).iloc[:700]
+    cube_path = snapshot_path(path, "_cube.parquet")
+    write_snapshot(path, snapshot_path(path))
+    cube = load_cube(path, cube_path)
+    cube.derived("trends", Trends)
+    cube.derived("moments", RangeMoments)
+    cube.filtered({"weathersit": [1]})
+    load_derived(path, "time_index", TimeIndex)
+    load_derived(path, "bitmaps", BitmapIndex)
+    load_report(path)
+    old_stamp = _source_stamp(path)
+
+    appended = append_records(path, new_records, cube_path)
+    full = read_dataset(path)
+    cells = build_cube(full)
+    pd.testing.assert_frame_equal(appended.cells, cells)
+    assert appended.index is not cube.index
+    fresh = Cube(cells)
+    for col in MEASURES:
+        np.testing.assert_array_equal(appended.index.prefix[col], fresh.index.prefix[col])
+    trends = appended.derived("trends", lambda cells: None)
+    for name, values in Trends(cells).columns.items():
+        np.testing.assert_array_equal(trends.columns[name], values)
+    moments = appended.derived("moments", lambda cells: None)
+    pd.testing.assert_frame_equal(moments.corr(full["order_date"].min(), full["order_date"].max()),
+                                  RangeMoments(cells).corr(full["order_date"].min(), full["order_date"].max()))
+    bitmaps = appended.derived("bitmaps", lambda cells: None)
+    np.testing.assert_array_equal(bitmaps.rows({"weathersit": [1]}), BitmapIndex(cells).rows({"weathersit": [1]}))
+
+    # Proses lain (dashboard) melipat baris baru dari jurnal append ke frame, indeks dan laporannya,
+    # tanpa membaca ulang atau memvalidasi ulang seluruh CSV
+    expected_checks = validate_csv(path)["checks"]
+
+    def full_scan(*args, **kwargs):
+        raise AssertionError("full CSV scan after append")
+    monkeypatch.setattr(loader, "read_dataset", full_scan)
+    monkeypatch.setattr(validate, "validate_csv", full_scan)
+    pd.testing.assert_frame_equal(load_dataset(path), full)
+    assert dataset_version(path) == hashlib.sha1(open(path, "rb").read()).hexdigest()
+    index = load_derived(path, "time_index", lambda df: None)
+    np.testing.assert_array_equal(index.prefix["cnt"], TimeIndex(full).prefix["cnt"])
+    report = load_report(path)
+    assert report["checks"] == expected_checks
+    assert report["rows"] == len(full)
+    cube_module._cache[cube_path] = {"stamp": old_stamp, "cube": cube}
+    reloaded = load_cube(path, cube_path)
+    pd.testing.assert_frame_equal(reloaded.cells, cells)
+    assert reloaded.derived("trends", lambda cells: None) is not None
+    assert snapshot_is_current(snapshot_path(path), path)
+    snapshot = read_snapshot(snapshot_path(path))
+    pd.testing.assert_frame_equal(snapshot, compact_frame(full)[snapshot.columns], check_dtype=False)
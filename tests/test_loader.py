@@ -0,0 +1,14 @@
+import os
+
+from loader import snapshot_path
+from validate import report_path_for
+
+
+def test_snapshot_paths_differ_per_source_path(tmp_path):
+    paths = ["day.csv", os.path.join("data", "day.csv"), os.path.join("dashboard", "day.csv")]
+    cubes = {snapshot_path(path, "_cube.parquet") for path in paths}
+    reports = {report_path_for(path) for path in paths}
+    assert len(cubes) == len(reports) == 3
+    assert all(os.path.basename(cube).startswith("day_") for cube in cubes)
+    # Path relatif dan absolut ke file yang sama memakai berkas turunan yang sama
+    assert snapshot_path("day.csv") == snapshot_path(os.path.abspath("day.csv"))
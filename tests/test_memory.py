@@ -0,0 +1,24 @@
+import pandas as pd
+
+from loader import read_dataset
+from memory import column_buffers, frame_bytes, owned_bytes
+from synthetic import write_synthetic
+
+
+def test_slices_of_shared_frames_are_not_session_owned(tmp_path):
+    path = str(tmp_path / "stations.csv")
+    write_synthetic("day", path, 2, stations=2)
+    shared = read_dataset(path)
+    shared["weathersit_label"] = pd.Categorical(shared["weathersit"].astype(str))
+
+    # Semua kolom dataset (int, float, datetime, str, category) harus punya buffer yang diketahui;
+    # kalau pandas mengubah penyimpanannya, tes ini gagal alih-alih laporan memori salah diam-diam
+    assert all(column_buffers(shared[col]) is not None for col in shared.columns)
+
+    view = shared.iloc[100:400]
+    assert owned_bytes(view, [shared]) == 0
+    assert owned_bytes(view[["order_date", "station", "cnt"]], [shared]) == 0
+    # Salinan kolom numpy/kategori milik sesi; array Arrow tidak bisa diubah sehingga copy()
+    # tetap berbagi buffer yang sama dan tidak dihitung
+    copy = view.copy()
+    assert owned_bytes(copy, [shared]) == frame_bytes(copy.drop(columns="station"))
@@ -0,0 +1,28 @@
+import os
+
+import numpy as np
+import pytest
+
+from cube import Cube, build_cube
+from loader import read_dataset
+from moments import MOMENT_COLUMNS, RangeMoments
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("name", ["day.csv", os.path.join("data", "hour.csv")])
+def test_range_moments_match_pandas(name):
+    df = read_dataset(os.path.join(ROOT, name))
+    moments = RangeMoments(build_cube(df))
+    rows = df[(df["order_date"] >= "2011-05-03") & (df["order_date"] < "2012-02-18")][MOMENT_COLUMNS]
+    np.testing.assert_allclose(moments.cov("2011-05-03", "2012-02-17").to_numpy(), rows.cov().to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(moments.corr("2011-05-03", "2012-02-17").to_numpy(), rows.corr().to_numpy(), rtol=1e-9)
+
+
+def test_filtered_cube_moments_match_pandas():
+    df = read_dataset(os.path.join(ROOT, "data", "hour.csv"))
+    cube = Cube(build_cube(df)).filtered({"weathersit": [2, 3], "workingday": [1]})
+    moments = cube.derived("moments", RangeMoments)
+    rows = df[df["weathersit"].isin([2, 3]) & (df["workingday"] == 1)][MOMENT_COLUMNS]
+    np.testing.assert_allclose(moments.corr(df["order_date"].min(), df["order_date"].max()).to_numpy(),
+                               rows.corr().to_numpy(), rtol=1e-9)
@@ -0,0 +1,89 @@
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import stations
+from cube import build_cube
+from ingest import append_records
+from loader import prepare_frame, read_dataset
+from stations import STATION_ROW_GROUP_ROWS, _rollup_group, check_station_order, load_station_cube
+from synthetic import write_synthetic
+from warmup import Warmer
+
+
+def test_worker_reads_only_its_stations(tmp_path):
+    path = str(tmp_path / "stations.csv")
+    write_synthetic("day", path, 60, stations=60)
+    cube_path = str(tmp_path / "station_cube.parquet")
+    station_cube = load_station_cube(path, cube_path)
+    assert pq.ParquetFile(cube_path).metadata.num_row_groups == -(-len(station_cube.cells) // STATION_ROW_GROUP_ROWS)
+
+    group = station_cube.stations[:3]
+    partial = _rollup_group(cube_path, station_cube.stamp, group)
+    pd.testing.assert_frame_equal(partial, station_cube.rollup(group), check_dtype=False)
+    table = pq.read_table(cube_path, filters=[("station", "in", group)])
+    assert table.num_rows < len(station_cube.cells)
+    station_cube.close()
+
+
+def test_warmer_builds_all_stations_rollup_in_its_thread(tmp_path):
+    path = str(tmp_path / "stations.csv")
+    write_synthetic("day", path, 3, stations=3)
+    station_cube = load_station_cube(path, str(tmp_path / "station_cube.parquet"))
+    warmer = Warmer(station_cube, [(station_cube.min_date, station_cube.max_date)])
+    assert not station_cube.is_cached()
+    warmer.start().join()
+    assert station_cube.is_cached() and warmer.cube is station_cube.full()
+    assert warmer.done == 1 and not warmer.errors
+    station_cube.close()
+
+
+def _split_stations(path, cutoff):
+    # Sebelum cutoff tetap di file, sesudahnya menjadi rekaman baru (urut per hari, stasiun berselang-seling)
+    df = pd.read_csv(path)
+    df[df["dteday"] < cutoff].to_csv(path, index=False)
+    return df[df["dteday"] >= cutoff].drop(columns="instant").sort_values(["dteday", "station"], kind="stable")
+
+
+def test_check_station_order(tmp_path):
+    path = str(tmp_path / "stations.csv")
+    write_synthetic("day", path, 3, stations=3)
+    new_records = _split_stations(path, "2012-12-01")
+    station_cube = load_station_cube(path, str(tmp_path / "station_cube.parquet"))
+
+    check_station_order(station_cube, prepare_frame(new_records.copy()))
+    # Hari terakhir yang sudah ada di cube (day.csv) dan urutan mundur dalam satu stasiun ditolak
+    last_day = pd.read_csv(path).tail(1)
+    with pytest.raises(ValueError, match="S0003"):
+        check_station_order(station_cube, prepare_frame(pd.concat([last_day, new_records])))
+    backwards = new_records[new_records["station"] == "S0001"].iloc[::-1]
+    with pytest.raises(ValueError, match="strictly increasing"):
+        check_station_order(station_cube, prepare_frame(backwards.copy()))
+    station_cube.close()
+
+
+def test_station_append_extends_the_all_stations_rollup(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = "stations.csv"
+    write_synthetic("day", path, 3, stations=3)
+    new_records = _split_stations(path, "2012-12-01")
+    cube_path = str(tmp_path / "station_cube.parquet")
+    station_cube = load_station_cube(path, cube_path)
+    full = station_cube.full()
+    old_stamp = station_cube.stamp
+
+    appended = append_records(path, new_records, cube_path)
+    expected = build_cube(read_dataset(path), ["station"])
+    pd.testing.assert_frame_equal(appended.cells, expected)
+    assert appended.is_cached() and appended.full() is not full
+    pd.testing.assert_frame_equal(appended.full().cells, appended.rollup(appended.stations))
+    assert appended.full().index.totals(appended.min_date, appended.max_date) == \
+        {col: int(expected[col].sum()) for col in ["casual", "registered", "cnt"]}
+    appended.close()
+
+    # Proses dashboard dengan cube versi lama melipat baris baru dari jurnal append
+    stations._cache[cube_path] = {"stamp": old_stamp, "cube": station_cube}
+    reloaded = load_station_cube(path, cube_path)
+    pd.testing.assert_frame_equal(reloaded.cells, expected)
+    assert reloaded.is_cached() and reloaded is not appended
+    reloaded.close()
@@ -0,0 +1,27 @@
+import os
+
+import pandas as pd
+
+from synthetic import write_synthetic
+from validate import validate_csv
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_multi_year_calendar(tmp_path):
+    path = str(tmp_path / "day_4y.csv")
+    write_synthetic("day", path, 2, stations=1, years=4)
+    df = pd.read_csv(path)
+    dates = pd.to_datetime(df["dteday"])
+
+    # Salinan pertama sama persis dengan data sumber, salinan kedua mengisi 2013-2014 tanpa hari ganda
+    source = pd.read_csv(os.path.join(ROOT, "day.csv"))
+    pd.testing.assert_frame_equal(df.iloc[:len(source)], source)
+    assert list(dates) == list(pd.date_range("2011-01-01", "2014-12-31"))
+    assert (df["yr"] == dates.dt.year - 2011).all()
+    assert (df["weekday"] == (dates.dt.dayofweek + 1) % 7).all()
+    assert not ((dates.dt.dayofweek >= 5) & (df["workingday"] == 1)).any()
+
+    checks = {check["check"]: check for check in validate_csv(path)["checks"]}
+    assert checks["rows per day"]["failed"] == 0
+    assert checks["duplicate rows"]["failed"] == 0
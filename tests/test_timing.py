@@ -0,0 +1,21 @@
+import datetime
+
+from timing import StageTimer, read_log
+
+
+def test_fragment_records_carry_flush_fields(tmp_path, monkeypatch):
+    path = tmp_path / "timings.jsonl"
+    monkeypatch.setattr("timing.TIMING_LOG", str(path))
+    timer = StageTimer("s1")
+    with timer.stage("aggregates"):
+        pass
+    timer.flush(start_date=datetime.date(2011, 3, 1), end_date=datetime.date(2011, 6, 30), backend="Image")
+    # Rerun fragment setelah rerun penuh
+    with timer.stage("corr"):
+        pass
+
+    full, fragment = read_log(path)
+    assert fragment["run"] == "fragment"
+    assert list(fragment["stages"]) == ["corr"]
+    for field in ["start_date", "end_date", "backend"]:
+        assert fragment[field] == full[field]
@@ -0,0 +1,72 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from aggregate import MEASURES
+
+
+def extend_prefix(prefix, keep, values):
+    # Prefix-sum baru: prefix[:keep + 1] dipakai ulang, dilanjutkan cumsum values (baris baru)
+    out = np.empty((keep + 1 + len(values),) + prefix.shape[1:], dtype=prefix.dtype)
+    out[:keep + 1] = prefix[:keep + 1]
+    np.cumsum(values, axis=0, out=out[keep + 1:])
+    out[keep + 1:] += prefix[keep]
+    return out
+
+
+class TimeIndex:
+    # Indeks waktu terurut: slicing rentang via searchsorted (O(log n))
+    # dan total rentang via selisih prefix-sum (O(1) per ukuran).
+
+    def __init__(self, df, measures=MEASURES):
+        df = df.sort_values("order_date", kind="stable").reset_index(drop=True)
+        self.df = df
+        self.measures = list(measures)
+        self.timestamps = df["order_date"].to_numpy()
+        self.prefix = {}
+        for col in self.measures:
+            prefix = np.zeros(len(df) + 1, dtype=np.int64)
+            np.cumsum(df[col].to_numpy(dtype=np.int64), out=prefix[1:])
+            self.prefix[col] = prefix
+
+    def extended(self, df, split):
+        # Indeks versi baru df (baris [0, split) sama dengan versi lama, sisanya baru): hanya baris
+        # baru yang diurutkan dan dijumlahkan. Dibangun ulang bila baris baru tidak jatuh di
+        # belakang urutan waktu baris lama.
+        tail = df.iloc[split:].sort_values("order_date", kind="stable")
+        if split > len(self) or (split and len(tail) and tail["order_date"].iloc[0] < self.timestamps[split - 1]):
+            return TimeIndex(df, self.measures)
+        index = copy.copy(self)
+        index.df = pd.concat([self.df.iloc[:split], tail], ignore_index=True)
+        index.timestamps = index.df["order_date"].to_numpy()
+        index.prefix = {col: extend_prefix(self.prefix[col], split, tail[col].to_numpy(dtype=np.int64))
+                        for col in self.measures}
+        return index
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    @property
+    def min_date(self):
+        return self.df["order_date"].iloc[0]
+
+    @property
+    def max_date(self):
+        return self.df["order_date"].iloc[-1]
+
+    def bounds(self, start_date, end_date):
+        # end_date inklusif sampai akhir hari, jadi baris per jam ikut terhitung
+        start = np.datetime64(pd.Timestamp(start_date).normalize())
+        end = np.datetime64(pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1))
+        lo = int(np.searchsorted(self.timestamps, start, side="left"))
+        hi = int(np.searchsorted(self.timestamps, end, side="left"))
+        return lo, max(lo, hi)
+
+    def slice(self, start_date, end_date):
+        lo, hi = self.bounds(start_date, end_date)
+        return self.df.iloc[lo:hi]
+
+    def totals(self, start_date, end_date):
+        lo, hi = self.bounds(start_date, end_date)
+        return {col: int(self.prefix[col][hi] - self.prefix[col][lo]) for col in self.measures}
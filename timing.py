@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Log JSON-lines per rerun; kosongkan DASHBOARD_TIMING_LOG untuk mematikan
+TIMING_LOG = os.environ.get("DASHBOARD_TIMING_LOG", "logs/timings.jsonl")
+
+_log_lock = threading.Lock()
+
+
+class StageTimer:
+    # Mencatat durasi tiap tahap bernama dalam satu rerun (ms, perf_counter)
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.flushed = False
+        # Field rerun penuh (rentang tanggal, backend, ...) ikut dicatat di record fragment
+        self.fields = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            # Rerun fragment terjadi setelah rerun penuh selesai: dicatat sebagai record sendiri
+            if self.flushed:
+                write_record(self.record("fragment", {name: elapsed}, **self.fields))
+
+    def record(self, run, stages, **fields):
+        return {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "session_id": self.session_id,
+            "run": run,
+            **fields,
+            "stages": {name: round(ms, 3) for name, ms in stages.items()},
+        }
+
+    def flush(self, **fields):
+        self.stages["total"] = (time.perf_counter() - self.started) * 1000
+        self.flushed = True
+        self.fields = fields
+        write_record(self.record("full", self.stages, **fields))
+
+
+def write_record(record, path=None):
+    path = TIMING_LOG if path is None else path
+    if not path:
+        return
+    line = json.dumps(record, default=str) + "\n"
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "a") as f:
+                f.write(line)
+    except OSError:
+        # Direktori read-only (mis. deploy) tidak boleh menggagalkan halaman
+        pass
+
+
+def read_log(path):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def summarize(records):
+    # {stage: [durasi ms, ...]} -> count, p50, p95, max per tahap
+    durations = {}
+    for record in records:
+        for name, ms in record["stages"].items():
+            durations.setdefault(name, []).append(ms)
+    summary = {}
+    for name, values in durations.items():
+        values = np.asarray(values)
+        summary[name] = {
+            "count": len(values),
+            "p50": float(np.percentile(values, 50)),
+            "p95": float(np.percentile(values, 95)),
+            "max": float(values.max()),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize dashboard stage timings (p50/p95 per stage)")
+    parser.add_argument("log_path", nargs="?", default=TIMING_LOG or "logs/timings.jsonl")
+    parser.add_argument("--session", default=None, help="only records from this session id")
+    args = parser.parse_args()
+
+    records = [r for r in read_log(args.log_path) if args.session in (None, r["session_id"])]
+    summary = summarize(records)
+    print(f"{len(records)} records from {args.log_path}")
+    print(f"{'stage':<28} {'count':>7} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+    for name, stats in sorted(summary.items(), key=lambda item: -item[1]["p95"]):
+        print(f"{name:<28} {stats['count']:>7} {stats['p50']:>10.2f} {stats['p95']:>10.2f} {stats['max']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
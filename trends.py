@@ -0,0 +1,110 @@
+import copy
+import functools
+
+import numpy as np
+import pandas as pd
+
+from aggregate import create_daily_rollup
+from timeindex import extend_prefix
+
+WINDOWS = [7, 28]
+
+TREND_LABELS = {
+    "ma_7": "7-day average",
+    "ma_28": "28-day average",
+    "last_year": "Same day last year",
+}
+
+
+def window_sums(prefix, window, start=0):
+    # Kernel jendela berbasis cumsum: sum[i] = prefix[i+1] - prefix[i+1-window] untuk posisi
+    # start..n-1, O(n - start) sekali jalan. Posisi yang jendelanya belum penuh bernilai NaN.
+    n = len(prefix) - 1
+    sums = np.full(max(0, n - start), np.nan)
+    first = max(start, window - 1)
+    if n > first:
+        sums[first - start:] = prefix[first + 1:] - prefix[first + 1 - window:n + 1 - window]
+    return sums
+
+
+class Trends:
+    # Statistik tren atas rollup harian seluruh riwayat, dihitung sekali per versi data.
+    # Setiap rentang hanya slicing array yang sudah jadi (hasilnya di-cache per rentang).
+
+    def __init__(self, cells):
+        daily = create_daily_rollup(cells, dimensions={})
+        self.dates = daily["order_date"].to_numpy().astype("datetime64[D]")
+        self.total = daily["cnt"].to_numpy(dtype=np.float64)
+        self.prefix = np.zeros(1)
+        self.columns = {}
+        self.last_year_pos = np.zeros(0, dtype=np.int64)
+        self._compute(0)
+
+    def _compute(self, keep):
+        # Kolom hari [0, keep) tetap dari versi sebelumnya, hari sesudahnya dihitung dari
+        # self.dates/self.total yang sudah diperpanjang
+        self.prefix = extend_prefix(self.prefix, keep, self.total[keep:])
+
+        columns = {"total": self.total}
+        for window in WINDOWS:
+            sums = np.concatenate([self.columns[f"sum_{window}"][:keep] if keep else np.zeros(0),
+                                   window_sums(self.prefix, window, keep)])
+            columns[f"sum_{window}"] = sums
+            columns[f"ma_{window}"] = sums / window
+
+        # Tanggal yang sama tahun lalu (29 Feb dipasangkan dengan 28 Feb)
+        dates = self.dates[keep:]
+        last_year = (pd.DatetimeIndex(dates) - pd.DateOffset(years=1)).to_numpy().astype("datetime64[D]")
+        pos = np.searchsorted(self.dates, last_year)
+        found = pos < len(self.dates)
+        found[found] = self.dates[pos[found]] == last_year[found]
+        self.last_year_pos = np.concatenate([self.last_year_pos[:keep], np.where(found, pos, -1)])
+        previous = np.full(len(dates), np.nan)
+        previous[found] = self.total[pos[found]]
+        columns["last_year"] = np.concatenate([self.columns["last_year"][:keep] if keep else np.zeros(0), previous])
+        self.columns = columns
+
+        self.series = functools.lru_cache(maxsize=64)(self._series)
+
+    def extended(self, cells, split):
+        # Tren versi cube setelah append (sel [0, split) tidak berubah): hanya hari sejak sel
+        # pertama yang berubah yang di-rollup ulang, prefix dan jendela lama dipakai ulang
+        tail = create_daily_rollup(cells.iloc[split:], dimensions={})
+        if not len(tail):
+            return self
+        dates = tail["order_date"].to_numpy().astype("datetime64[D]")
+        total = tail["cnt"].to_numpy(dtype=np.float64)
+        keep = int(np.searchsorted(self.dates, dates[0], side="left"))
+        # Hari kosong antara data lama dan baru tetap muncul dengan total 0 (seperti rollup penuh)
+        if keep:
+            gap = np.arange(self.dates[keep - 1] + np.timedelta64(1, "D"), dates[0])
+            dates = np.concatenate([gap, dates])
+            total = np.concatenate([np.zeros(len(gap)), total])
+        trends = copy.copy(self)
+        trends.dates = np.concatenate([self.dates[:keep], dates])
+        trends.total = np.concatenate([self.total[:keep], total])
+        trends._compute(keep)
+        return trends
+
+    def _bounds(self, start_date, end_date):
+        start = np.datetime64(pd.Timestamp(start_date).date())
+        end = np.datetime64(pd.Timestamp(end_date).date())
+        lo = int(np.searchsorted(self.dates, start, side="left"))
+        hi = int(np.searchsorted(self.dates, end, side="right"))
+        return lo, max(lo, hi)
+
+    def _series(self, start_date, end_date):
+        lo, hi = self._bounds(start_date, end_date)
+        series = pd.DataFrame({"order_date": pd.DatetimeIndex(self.dates[lo:hi])})
+        for name, values in self.columns.items():
+            series[name] = values[lo:hi]
+        return series
+
+    def window_totals(self, end_date, window):
+        # Jumlah `window` hari yang berakhir di end_date dan jendela yang sama tahun lalu (NaN bila tidak ada)
+        _, hi = self._bounds(end_date, end_date)
+        if hi == 0:
+            return np.nan, np.nan
+        sums = self.columns[f"sum_{window}"]
+        previous = self.last_year_pos[hi - 1]
+        return sums[hi - 1], sums[previous] if previous >= 0 else np.nan
@@ -0,0 +1,234 @@
+import argparse
+import copy
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from aggregate import MEASURES
+from loader import appended_bytes, read_appended, snapshot_path
+
+# Kode kategori yang valid menurut Readme dataset
+CATEGORY_CODES = {
+    "season": [1, 2, 3, 4],
+    "yr": None,
+    "mnth": list(range(1, 13)),
+    "hr": list(range(24)),
+    "holiday": [0, 1],
+    "weekday": list(range(7)),
+    "workingday": [0, 1],
+    "weathersit": [1, 2, 3, 4],
+}
+# Nilai cuaca sudah dinormalisasi ke [0, 1]
+UNIT_COLUMNS = ["temp", "atemp", "hum", "windspeed"]
+
+CHUNK_ROWS = 1_000_000
+
+# Cache laporan per proses: {path: (stamp, report)}
+_cache = {}
+_lock = threading.Lock()
+
+
+def report_path_for(csv_path, out_dir="snapshot"):
+    # Disimpan di samping snapshot/cube: data/hour.csv -> snapshot/hour_<digest path>_quality.json
+    return snapshot_path(csv_path, "_quality.json", out_dir)
+
+
+def _file_stamp(csv_path):
+    stat = os.stat(csv_path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _check(name, failed, level="error", detail=""):
+    return {"check": name, "failed": int(failed), "status": "ok" if failed == 0 else level, "detail": detail}
+
+
+def new_state():
+    # Penghitung validasi yang bisa dilipat per chunk; disimpan di laporan supaya baris hasil
+    # append cukup dilipat ke penghitung lama
+    return {"rows": 0, "counters": {}, "missing": {}, "day_counts": {}, "stations": [], "duplicates": 0}
+
+
+def fold_chunk(state, chunk):
+    # Satu scan per chunk, semua cek berupa operasi kolom; mengembalikan hash baris (8 byte per
+    # baris) untuk menghitung duplikat
+    counters = state["counters"]
+
+    def add(name, value):
+        counters[name] = counters.get(name, 0) + int(value)
+
+    state["rows"] += len(chunk)
+    for col, n in chunk.isna().sum().items():
+        state["missing"][col] = state["missing"].get(col, 0) + int(n)
+
+    if set(MEASURES) <= set(chunk.columns):
+        add("cnt_mismatch", (chunk["cnt"] != chunk["casual"] + chunk["registered"]).sum())
+        add("negative_counts", (chunk[MEASURES] < 0).any(axis=1).sum())
+    for col, codes in CATEGORY_CODES.items():
+        if col in chunk.columns:
+            values = chunk[col]
+            invalid = values.isna() | (values < 0) if codes is None else ~values.isin(codes)
+            add(f"invalid_{col}", invalid.sum())
+    for col in UNIT_COLUMNS:
+        if col in chunk.columns:
+            add(f"range_{col}", ((chunk[col] < 0) | (chunk[col] > 1)).sum())
+
+    dates = pd.to_datetime(chunk["dteday"], errors="coerce")
+    add("invalid_dteday", dates.isna().sum())
+    for day, n in dates.dropna().value_counts().items():
+        key = str(day.date())
+        state["day_counts"][key] = state["day_counts"].get(key, 0) + int(n)
+    if "station" in chunk.columns:
+        state["stations"] = sorted(set(state["stations"]) | set(chunk["station"].dropna().astype(str).unique()))
+
+    # Duplikat tanpa kolom `instant` (nomor baris selalu unik, seperti duplicated() di notebook)
+    return pd.util.hash_pandas_object(chunk.drop(columns=["instant"], errors="ignore"), index=False).to_numpy()
+
+
+def _duplicates(row_hashes):
+    hashes = np.sort(np.concatenate(row_hashes)) if row_hashes else np.zeros(0, dtype=np.uint64)
+    return int((hashes[1:] == hashes[:-1]).sum())
+
+
+def validate_csv(csv_path, chunk_rows=CHUNK_ROWS):
+    # Yang disimpan antar chunk hanya penghitung, jumlah baris per hari, dan hash baris
+    started = time.perf_counter()
+    state = new_state()
+    row_hashes = [fold_chunk(state, chunk) for chunk in pd.read_csv(csv_path, chunksize=chunk_rows)]
+    state["duplicates"] = _duplicates(row_hashes)
+    return build_report(csv_path, state, started)
+
+
+def fold_appended(report, csv_path, new_rows):
+    # Laporan versi setelah ingest.py append, dari penghitung laporan lama + baris baru saja.
+    # Baris baru tidak bisa menduplikasi baris lama: append menolak timestamp yang tidak lebih
+    # baru (per stasiun), jadi cukup duplikat di antara baris baru yang dihitung.
+    started = time.perf_counter()
+    state = copy.deepcopy(report["state"])
+    state["duplicates"] += _duplicates([fold_chunk(state, new_rows)])
+    return build_report(csv_path, state, started)
+
+
+def build_report(csv_path, state, started):
+    counters = state["counters"]
+    missing = state["missing"]
+    columns = list(missing)
+
+    checks = [_check("missing values", sum(missing.values()), detail=", ".join(f"{col}: {n}" for col, n in missing.items() if n))]
+    if "cnt_mismatch" in counters:
+        checks.append(_check("cnt == casual + registered", counters["cnt_mismatch"]))
+        checks.append(_check("non-negative counts", counters["negative_counts"]))
+    for col in CATEGORY_CODES:
+        if f"invalid_{col}" in counters:
+            codes = CATEGORY_CODES[col]
+            detail = "non-negative" if codes is None else f"{codes[0]}..{codes[-1]}"
+            checks.append(_check(f"valid {col} codes", counters[f"invalid_{col}"], detail=detail))
+    for col in UNIT_COLUMNS:
+        if f"range_{col}" in counters:
+            checks.append(_check(f"{col} in [0, 1]", counters[f"range_{col}"]))
+    checks.append(_check("valid dteday", counters.get("invalid_dteday", 0)))
+    checks.append(_check("duplicate rows", state["duplicates"]))
+
+    # Satu baris per hari (24 untuk hour.csv), dikali jumlah stasiun bila ada
+    expected = (24 if "hr" in columns else 1) * max(1, len(state["stations"]))
+    if state["day_counts"]:
+        day_counts = pd.Series(state["day_counts"])
+        day_counts.index = pd.to_datetime(day_counts.index)
+        calendar = pd.date_range(day_counts.index.min(), day_counts.index.max(), freq="D")
+        per_day = day_counts.reindex(calendar, fill_value=0)
+        short = int((per_day < expected).sum())
+        over = int((per_day > expected).sum())
+        checks.append(_check("rows per day", short + over, level="warning",
+                             detail=f"expected {expected}; {short} days below, {over} days above"))
+        first, last = str(calendar[0].date()), str(calendar[-1].date())
+    else:
+        first = last = None
+
+    return {
+        "path": csv_path,
+        "rows": state["rows"],
+        "columns": columns,
+        "first_date": first,
+        "last_date": last,
+        "checks": checks,
+        "status": summary_status(checks),
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "state": state,
+    }
+
+
+def summary_status(checks):
+    statuses = {check["status"] for check in checks}
+    return "error" if "error" in statuses else "warning" if "warning" in statuses else "ok"
+
+
+def load_report(csv_path, report_path=None):
+    # Validasi sekali per versi data: cache proses, lalu file JSON, baru scan ulang
+    report_path = report_path or report_path_for(csv_path)
+    stamp = _file_stamp(csv_path)
+    key = os.path.abspath(csv_path)
+    with _lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        report = None
+        try:
+            with open(report_path) as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if report is None and cached is not None:
+            report = cached[1]
+        if report is None or report.get("source_stamp") != stamp:
+            # Versi hasil ingest.py append: baris baru dilipat ke penghitung laporan lama
+            appended = None
+            if report is not None and "state" in report:
+                appended = appended_bytes(csv_path, report["source_stamp"], stamp)
+            if appended is not None:
+                report = fold_appended(report, csv_path, read_appended(*appended))
+            else:
+                report = validate_csv(csv_path)
+            report["source_stamp"] = stamp
+            try:
+                write_report(report, report_path)
+            except OSError:
+                # Direktori read-only: laporan tetap di-cache di memori
+                pass
+
+        _cache[key] = (stamp, report)
+        return report
+
+
+def write_report(report, report_path):
+    os.makedirs(os.path.dirname(report_path) or ".", exist_ok=True)
+    tmp_path = report_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, report_path)
+
+
+def failed_checks(report):
+    return [check for check in report["checks"] if check["status"] != "ok"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate a day/hour CSV once per data version and cache the report")
+    parser.add_argument("csv_path")
+    parser.add_argument("--report", default=None, help="report path (default: snapshot/<name>_<path digest>_quality.json)")
+    args = parser.parse_args()
+
+    report = load_report(args.csv_path, args.report)
+    print(f"{report['rows']:,} rows, {report['first_date']} .. {report['last_date']}, "
+          f"checked in {report['elapsed_s']} s: {report['status']}")
+    for check in report["checks"]:
+        print(f"  {check['status']:<8} {check['check']:<28} {check['failed']:>10,}  {check['detail']}")
+    if report["status"] == "error":
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
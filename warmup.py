@@ -0,0 +1,130 @@
+import argparse
+import datetime
+import os
+import threading
+import time
+
+import pandas as pd
+
+from trends import Trends
+
+# Rentang yang dihangatkan saat proses mulai: "full", "year", "month" (kosong = mati)
+WARM_RANGES = os.environ.get("DASHBOARD_WARM", "full,year,month")
+# "1" = gambar matplotlib ikut dirender ke cache PNG
+WARM_RENDER = os.environ.get("DASHBOARD_WARM_RENDER", "") == "1"
+
+_warmer = None
+_lock = threading.Lock()
+
+
+def common_ranges(min_date, max_date, kinds=("full", "year", "month")):
+    # Rentang (start, end) sebagai datetime.date, dipotong ke batas data
+    min_date = pd.Timestamp(min_date).date()
+    max_date = pd.Timestamp(max_date).date()
+    ranges = []
+    if "full" in kinds:
+        ranges.append((min_date, max_date))
+    if "year" in kinds:
+        for year in range(min_date.year, max_date.year + 1):
+            ranges.append((max(min_date, datetime.date(year, 1, 1)), min(max_date, datetime.date(year, 12, 31))))
+    if "month" in kinds:
+        for month in pd.date_range(min_date.replace(day=1), max_date, freq="MS"):
+            end = (month + pd.offsets.MonthEnd(1)).date()
+            ranges.append((max(min_date, month.date()), min(max_date, end)))
+    return list(dict.fromkeys(ranges))
+
+
+class Warmer:
+    # Mengisi cache agregat (dan opsional PNG) di thread latar; progres bisa dibaca kapan saja.
+    # source boleh Cube atau StationCube: rollup semua stasiun (full()) dibangun di thread ini,
+    # bukan di thread script yang sedang melayani rerun.
+
+    def __init__(self, source, ranges, render=False):
+        self.source = source
+        self.cube = None
+        self.ranges = list(ranges)
+        self.render = render
+        self.done = 0
+        self.errors = []
+        self.started = None
+        self.finished = None
+        self._thread = threading.Thread(target=self.run, name="cache-warmer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    @property
+    def total(self):
+        return len(self.ranges)
+
+    @property
+    def progress(self):
+        elapsed = ((self.finished or time.perf_counter()) - self.started) if self.started else 0.0
+        return {"done": self.done, "total": self.total, "errors": len(self.errors), "elapsed_s": elapsed,
+                "running": self._thread.is_alive()}
+
+    def run(self):
+        self.started = time.perf_counter()
+        try:
+            self.cube = self.source.full() if hasattr(self.source, "full") else self.source
+        except Exception as e:
+            self.errors.append((None, None, repr(e)))
+            self.finished = time.perf_counter()
+            return
+        trends = self.cube.derived("trends", Trends)
+        if self.render:
+            from charts import render_section_png
+        for start_date, end_date in self.ranges:
+            try:
+                aggregates = self.cube.aggregates(start_date, end_date)
+                trends.series(start_date, end_date)
+                if self.render:
+                    for section, df in aggregates.items():
+                        render_section_png(section, df)
+            except Exception as e:
+                self.errors.append((start_date, end_date, repr(e)))
+            self.done += 1
+            # Beri kesempatan thread sesi yang sedang rerun
+            time.sleep(0)
+        self.finished = time.perf_counter()
+
+
+def start_warmer(source, kinds=None, render=None):
+    # Satu warmer per versi cube per proses; rerun berikutnya hanya membaca progresnya
+    global _warmer
+    kinds = [kind for kind in (WARM_RANGES if kinds is None else kinds).split(",") if kind]
+    render = WARM_RENDER if render is None else render
+    with _lock:
+        if _warmer is None or _warmer.source is not source:
+            _warmer = Warmer(source, common_ranges(source.min_date, source.max_date, kinds), render)
+            if _warmer.ranges:
+                _warmer.start()
+        return _warmer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm the aggregate/render caches for common ranges and report timing")
+    parser.add_argument("csv_path", nargs="?", default="day.csv")
+    parser.add_argument("cube_path", nargs="?", default=None, help="default: the dashboard's cube for csv_path")
+    parser.add_argument("--ranges", default=WARM_RANGES, help="comma-separated: full, year, month")
+    parser.add_argument("--render", action="store_true", help="also render the matplotlib PNGs")
+    args = parser.parse_args()
+
+    from cube import load_cube
+    from loader import snapshot_path
+    cube = load_cube(args.csv_path, args.cube_path or snapshot_path(args.csv_path, "_cube.parquet"))
+    warmer = start_warmer(cube, args.ranges, args.render)
+    while warmer.progress["running"]:
+        warmer.join(1)
+        progress = warmer.progress
+        print(f"{progress['done']}/{progress['total']} ranges, {progress['elapsed_s']:.1f} s")
+    for start_date, end_date, error in warmer.errors:
+        print(f"failed {start_date} .. {end_date}: {error}")
+
+
+if __name__ == "__main__":
+    main()